@@ -0,0 +1,108 @@
+"""Compare the precompiled model validators with the per-item validation.
+
+Run from the root of the repository::
+
+    python -m benchmarks.modify_item [count]
+"""
+from contextlib import suppress
+from datetime import date, datetime, time, timedelta
+from sys import argv
+from timeit import timeit
+from typing import Any, Dict, Tuple, Type
+
+from dateutil.parser import isoparse
+from fastapi.exceptions import HTTPException
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.sql.schema import Column
+from starlette.status import HTTP_400_BAD_REQUEST
+
+from lib.methods._validator import ModelValidator
+from lib.methods.endpoint import _get_keys
+from lib.models.base_interface import BaseInterface
+from lib.models.containers.container_model import ContainerModel
+
+
+def _coerce_value(column: Column, value: Any, /) -> Any:
+    ctype = None
+    with suppress(NotImplementedError):
+        ctype = column.type.python_type
+    if ctype is None or isinstance(value, (ctype, type(None))):
+        return value
+    elif ctype == date:
+        return isoparse(value).date()
+    elif ctype == time:
+        return isoparse(value).time()
+    elif ctype == datetime:
+        return isoparse(value)
+    elif ctype == timedelta:
+        if isinstance(value, (int, float)):
+            return timedelta(seconds=value)
+    return value
+
+
+def modify_item(
+    model: Type[BaseInterface],
+    item: Dict[str, Any],
+    /,
+    field_chain: Tuple[str, ...] = (),
+) -> BaseInterface:
+    """The validation of the item before the precompiled validators."""
+    column_keys, relationship_keys = _get_keys(model)
+    item = dict.fromkeys(column_keys) | item
+    for field, value in dict(item).items():
+        if field in column_keys:
+            if field in {'created_at', 'updated_at'}:
+                del item[field]
+                continue
+            column = column_keys[field]
+            if (
+                (not field_chain and value is None)
+                and column.default is None
+                and not column.nullable
+                and column.autoincrement is not True
+            ):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    'Table `{name}` requires fields: {fields}.'.format(
+                        name=model.__tablename__,
+                        fields=', '.join(
+                            f'`{column.key}`'
+                            for column in column_keys.values()
+                            if column.default is None
+                            and not column.nullable
+                            and column.autoincrement is not True
+                        ),
+                    ),
+                )
+            item[field] = _coerce_value(column, value)
+        elif relationship := relationship_keys.get(field):
+            if not value:
+                del item[field]
+    return model(**item)
+
+
+def main(count: int = 10000, /) -> None:
+    configure_mappers()
+    items = [
+        dict(
+            id=index,
+            owner_id=index,
+            latitude='47.024512',
+            longtitude='28.832263',
+            created_at='2022-08-01T12:00:00+03:00',
+            tanks=[],
+        )
+        for index in range(count)
+    ]
+    validator = ModelValidator.get(ContainerModel)
+    for name, function in (
+        ('per-item', lambda: [modify_item(ContainerModel, _) for _ in items]),
+        ('items', lambda: validator.get_item(items)),
+        ('rows', lambda: [validator.get_row(_) for _ in items]),
+    ):
+        seconds = timeit(function, number=5) / 5
+        print(f'{name:>10}: {seconds * 1000:8.2f} ms per {count} items')
+
+
+if __name__ == '__main__':
+    main(*map(int, argv[1:]))
@@ -0,0 +1,55 @@
+from logging import Logger
+from typing import Dict, Final
+
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from sqlalchemy.sql.expression import text
+from sqlalchemy.sql.schema import MetaData
+
+from ..models._mixins import get_sum_targets, reconcile_sum
+
+#
+logger: Final[Logger] = Logger(__file__)
+
+
+async def reconcile_sums(
+    metadata: MetaData,
+    /,
+    bind: AsyncEngine,
+) -> Dict[str, int]:
+    """Rebuild the sums maintained by the triggers from the summed rows.
+
+    The involved tables are locked against the writes for the duration, so
+    the rebuilt sums are exact. Returns the number of the corrected rows of
+    each sum.
+    """
+    targets = get_sum_targets(metadata)
+    tables = sorted(
+        {target.table for target in targets}
+        | {
+            column.table
+            for target in targets
+            for column, _ in target.info['sums']
+        },
+        key=lambda _: _.name,
+    )
+    corrected: Dict[str, int] = {}
+    if not targets:
+        return corrected
+
+    async with bind.begin() as connection:
+        await connection.execute(
+            text(
+                'LOCK TABLE %s IN SHARE ROW EXCLUSIVE MODE'
+                % ', '.join(_.name for _ in tables)
+            )
+        )
+        for target in targets:
+            table = target.table
+            result = await connection.execute(reconcile_sum(target))
+            corrected[f'{table.name}.{target.name}'] = result.rowcount
+            if result.rowcount:
+                logger.warning(
+                    f'Sum {table.name}.{target.name} corrected '
+                    f'in {result.rowcount} rows.'
+                )
+    return corrected
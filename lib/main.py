@@ -3,7 +3,7 @@ from datetime import datetime
 from logging import Filter, Logger, LogRecord, basicConfig, getLogger
 from os import environ
 from pathlib import Path
-from typing import Any, Final
+from typing import Any, Final, Tuple
 from urllib.parse import unquote
 
 from dateutil.tz.tz import tzlocal
@@ -12,11 +12,10 @@ from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.security.oauth2 import OAuth2PasswordBearer
 from orjson import dumps
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio.engine import create_async_engine
+from sqlalchemy.ext.asyncio.engine import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio.scoping import async_scoped_session
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm.session import sessionmaker
-from sqlalchemy.pool.impl import AsyncAdaptedQueuePool
 from starlette.middleware import Middleware
 from starlette.responses import JSONResponse, Response
 from starlette.routing import Route
@@ -26,12 +25,36 @@ from uvicorn import run
 
 from .callbacks.create_visual_schema import create_visual_schema
 from .methods._exception_handlers import sqlalchemy_error_handler
-from .methods.endpoint import endpoint, endpoint_info
+from .methods._geo_index import GeoIndex
+from .methods._response_cache import ResponseCache
+from .methods._translation_store import TranslationStore
+from .methods._validator import compile_validators
+from .methods.endpoint import (
+    EndPoint,
+    endpoint,
+    endpoint_batch,
+    endpoint_info,
+    endpoint_near,
+    endpoint_rollup,
+    endpoint_stats,
+)
+from .methods.reconcile import reconcile
+from .methods.refresh_rollups import refresh_rollups
 from .methods.schema import schema
 from .methods.test_database import test_database
+from .methods.translations import translations
 from .middleware.add_to_scope_middleware import AddToScopeMiddleware
 from .middleware.async_sqlalchemy_middleware import AsyncSQLAlchemyMiddleware
-from .models.base_interface import Base, serialize
+from .middleware.replica_routing_middleware import ReplicaRoutingMiddleware
+from .models._mixins import Rollup
+from .models.base_interface import Base, compile_serializers, serialize
+from .models.containers.container_model import ContainerModel
+from .models.misc.locales.locale_model import LocaleModel
+from .models.misc.locales.text_locale_model import TextLocaleModel
+from .models.misc.locales.text_model import TextModel
+from .models.misc.settings_model import SettingsModel
+from .utils.pool_manager import InstrumentedPool, PoolManager
+from .utils.rollup_refresher import RollupRefresher
 
 
 class _DefaultORJSONResponse(JSONResponse):
@@ -53,23 +76,71 @@ class _EndpointFilter(Filter):
 basicConfig(level=environ.get('LOGGING', 'INFO'))
 getLogger('uvicorn.access').addFilter(_EndpointFilter())
 schema_path: Final[Path] = Path('./lib/schema.png').resolve()
+pool_size: Final[int] = int(environ.get('DATABASE_POOL_SIZE', 5))
+
+
+def _create_engine(url: str, /) -> AsyncEngine:
+    return create_async_engine(
+        echo=True,  # environ.get('LOGGING', '').upper() == 'DEBUG',
+        url='postgresql+asyncpg://' + url.split('://')[-1],
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=int(environ.get('DATABASE_MAX_OVERFLOW', 10)),
+        pool_timeout=float(environ.get('DATABASE_POOL_TIMEOUT', 30)),
+        pool_recycle=3600,
+        pool_use_lifo=True,
+        connect_args=dict(server_settings=dict(jit='off')),
+    )
+
+
+engine: Final[AsyncEngine] = _create_engine(
+    environ.get('DATABASE_URL', 'postgres:postgres@localhost:5432/postgres')
+)
+replicas: Final[Tuple[AsyncEngine, ...]] = tuple(
+    _create_engine(url.strip())
+    for url in environ.get('DATABASE_REPLICA_URLS', '').split(',')
+    if url.strip()
+)
+pool_manager: Final[PoolManager] = PoolManager(
+    engine,
+    *replicas,
+    warmup=int(environ.get('DATABASE_POOL_WARMUP', pool_size)),
+    interval=float(environ.get('DATABASE_POOL_HEALTH_INTERVAL', 30)),
+)
+EndPoint.response_cache = ResponseCache(
+    maxsize=int(environ.get('RESPONSE_CACHE_SIZE', 1024)),
+    ttl=float(environ.get('RESPONSE_CACHE_TTL', 60)),
+)
+EndPoint.geo_index = GeoIndex(
+    ContainerModel.__table__.c.id,
+    ContainerModel.__table__.c.latitude,
+    ContainerModel.__table__.c.longtitude,
+    cell=float(environ.get('GEO_INDEX_CELL', 0.05)),
+    ttl=float(environ.get('GEO_INDEX_TTL', 60)),
+)
+EndPoint.write_listeners.append(EndPoint.geo_index.invalidate)
+rollup_refresher: Final[RollupRefresher] = RollupRefresher(
+    engine,
+    [
+        mapper.class_
+        for mapper in Base.registry.mappers
+        if issubclass(mapper.class_, Rollup)
+    ],
+    interval=float(environ.get('ROLLUP_REFRESH_INTERVAL', 60)),
+    lag=float(environ.get('ROLLUP_REFRESH_LAG', 60)),
+)
+rollup_refresher.listeners.append(EndPoint.response_cache.invalidate)
+translation_store: Final[TranslationStore] = TranslationStore(
+    TextModel.__table__,
+    TextLocaleModel.__table__,
+    LocaleModel.__table__,
+    SettingsModel.__table__,
+    ttl=float(environ.get('TRANSLATION_STORE_TTL', 300)),
+)
+EndPoint.write_listeners.append(translation_store.invalidate)
 sqlalchemy: Final = async_scoped_session(
     sessionmaker(
-        create_async_engine(
-            echo=True,  # environ.get('LOGGING', '').upper() == 'DEBUG',
-            url='postgresql+asyncpg://'
-            + environ.get(
-                'DATABASE_URL',
-                'postgres:postgres@localhost:5432/postgres',
-            ).split('://')[-1],
-            poolclass=AsyncAdaptedQueuePool,
-            pool_size=1,
-            max_overflow=-1,
-            pool_recycle=3600,
-            pool_pre_ping=True,
-            pool_use_lifo=True,
-            connect_args=dict(server_settings=dict(jit='off')),
-        ),
+        engine,
         class_=AsyncSession,
         expire_on_commit=False,
         future=True,
@@ -78,6 +149,21 @@ sqlalchemy: Final = async_scoped_session(
 )
 
 
+def _compile_serializers() -> None:
+    return compile_serializers(Base)
+
+
+def _compile_validators() -> None:
+    return compile_validators(Base)
+
+
+async def _load_translations() -> None:
+    try:
+        return await translation_store.load(engine)
+    except SQLAlchemyError as _:
+        getLogger(__name__).warning(f'Translations are not loaded: {_!r}')
+
+
 async def _create_visual_schema() -> None:
     return await create_visual_schema(Base.metadata, path=schema_path)
 
@@ -86,7 +172,15 @@ app = FastAPI(
     version='0.0.1',
     docs_url=None,
     default_response_class=_DefaultORJSONResponse,
-    on_startup=(_create_visual_schema,),
+    on_startup=(
+        _compile_serializers,
+        _compile_validators,
+        pool_manager.start,
+        rollup_refresher.start,
+        _create_visual_schema,
+        _load_translations,
+    ),
+    on_shutdown=(rollup_refresher.stop,),
     exception_handlers={SQLAlchemyError: sqlalchemy_error_handler},
     dependencies=[OAuth2PasswordBearer(tokenUrl='token')],
     middleware=(
@@ -98,6 +192,9 @@ app = FastAPI(
             AddToScopeMiddleware,
             scope=lambda scope: dict(
                 schema_path=schema_path,
+                pool_manager=pool_manager,
+                rollup_refresher=rollup_refresher,
+                translation_store=translation_store,
                 logger=Logger('%(method)s %(path)s' % scope)
                 if scope['type'] == 'http'
                 else None,
@@ -109,6 +206,20 @@ app = FastAPI(
             else ()
         ),
         Middleware(AsyncSQLAlchemyMiddleware, metadata=Base, bind=sqlalchemy),
+        *(
+            (
+                Middleware(
+                    ReplicaRoutingMiddleware,
+                    primary=engine,
+                    replicas=replicas,
+                    lag_ttl=float(
+                        environ.get('DATABASE_REPLICA_LAG_TTL', 0.05)
+                    ),
+                ),
+            )
+            if replicas
+            else ()
+        ),
     ),
     routes=[
         Route('/', schema),
@@ -118,6 +229,13 @@ app = FastAPI(
             lambda request: Response(datetime.now(tzlocal()).isoformat()),
         ),
         Route('/settings/info', endpoint_info),
+        Route('/settings/stats', endpoint_stats),
+        Route('/settings/reconcile', reconcile, methods=['POST']),
+        Route('/settings/rollups', refresh_rollups, methods=['POST']),
+        Route('/batch', endpoint_batch, methods=['POST']),
+        Route('/containers/near', endpoint_near),
+        Route('/rollups/{route}', endpoint_rollup),
+        Route('/translations/{locale}', translations),
         *(
             Route(
                 '/'.join(
@@ -131,5 +249,5 @@ app = FastAPI(
     ],
 )
 
-if 'DATABASE_URL' not in environ:
-    run(app, host='localhost', port=8000, http='h11', loop='asyncio')
+if __name__ == '__main__':
+    run(app, host='localhost', port=8000)
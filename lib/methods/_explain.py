@@ -0,0 +1,35 @@
+from typing import Any, Final, Iterable
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ClauseElement
+from typing_extensions import Self
+
+
+class Explain(Executable, ClauseElement):
+    """The plan of the `statement` in JSON without executing it.
+
+    The bound parameters of the `statement` are compiled as usual, so the
+    planner estimates the rows of the same query that would be executed.
+    """
+
+    inherit_cache: Final[bool] = False
+
+    def __init__(self: Self, statement: Executable, /) -> None:
+        self.statement = statement
+
+    def get_children(self: Self, /, **kwargs: Any) -> Iterable[ClauseElement]:
+        return (self.statement,)
+
+
+@compiles(Explain)
+def _compile_explain(
+    element: Explain,
+    compiler: SQLCompiler,
+    /,
+    **kwargs: Any,
+) -> str:
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(
+        element.statement, **kwargs
+    )
@@ -0,0 +1,230 @@
+from asyncio import Lock
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from math import asin, atan2, cos, degrees, floor, radians, sin, sqrt
+from time import monotonic
+from typing import Any, Dict, Final, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.sql.schema import Column, Table
+from typing_extensions import Self
+
+#
+EARTH_RADIUS: Final[float] = 6371.0088
+DEGREE: Final[float] = EARTH_RADIUS * radians(1)
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between the points in kilometers."""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    return (
+        2
+        * EARTH_RADIUS
+        * asin(
+            sqrt(
+                sin((lat2 - lat1) / 2) ** 2
+                + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+            )
+        )
+    )
+
+
+@dataclass(init=False, frozen=True)
+class GeoIndex(object):
+    """The in-memory grid of the points of the `table` for the nearby search.
+
+    The points are bucketed into the cells of `cell` degrees and the cells
+    into the blocks of `block` cells a side. The search visits only the
+    occupied blocks and cells in the order of their least distance from the
+    origin, until none of them can be closer than the found points. The
+    candidates are ranked exactly by the haversine distance. The index is
+    reloaded lazily after a write to the `table` or after `ttl` seconds for
+    the writes of the other workers.
+    """
+
+    table: Final[Table]
+    key: Final[Column]
+    latitude: Final[Column]
+    longitude: Final[Column]
+    cell: Final[float]
+    block: Final[int]
+    ttl: Final[float]
+    _cells: Final[Dict[Tuple[int, int], List[Tuple[Any, float, float]]]]
+    _blocks: Final[Dict[Tuple[int, int], List[Tuple[int, int]]]]
+    _generation: Final[List[float]]
+    _lock: Final[Lock]
+    _stats: Final[Dict[str, int]]
+
+    def __init__(
+        self: Self,
+        /,
+        key: Column,
+        latitude: Column,
+        longitude: Column,
+        *,
+        cell: float = 0.05,
+        block: int = 16,
+        ttl: float = 60,
+    ) -> None:
+        object.__setattr__(self, 'table', key.table)
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'latitude', latitude)
+        object.__setattr__(self, 'longitude', longitude)
+        object.__setattr__(self, 'cell', cell)
+        object.__setattr__(self, 'block', block)
+        object.__setattr__(self, 'ttl', ttl)
+        object.__setattr__(self, '_cells', {})
+        object.__setattr__(self, '_blocks', {})
+        # The generations of the table and of the loaded points with the
+        # time the points expire.
+        object.__setattr__(self, '_generation', [1, 0, 0.0])
+        object.__setattr__(self, '_lock', Lock())
+        object.__setattr__(self, '_stats', dict(loads=0, searches=0, visits=0))
+
+    def invalidate(self: Self, tables: FrozenSet[Table], /) -> None:
+        if self.table in tables:
+            self._generation[0] += 1
+
+    @property
+    def stale(self: Self, /) -> bool:
+        return (
+            self._generation[0] != self._generation[1]
+            or self._generation[2] <= monotonic()
+        )
+
+    async def load(self: Self, Session: Any, /) -> None:
+        if not self.stale:
+            return
+        async with self._lock:
+            if not self.stale:
+                return
+            generation, expires = self._generation[0], monotonic() + self.ttl
+            result = await Session.execute(
+                self.table.select().with_only_columns(
+                    [self.key, self.latitude, self.longitude]
+                )
+            )
+            cells: Dict[Tuple[int, int], List[Tuple[Any, float, float]]] = {}
+            for key, latitude, longitude in result.all():
+                latitude, longitude = float(latitude), float(longitude)
+                cells.setdefault(
+                    self._get_cell(latitude, longitude), []
+                ).append((key, latitude, longitude))
+            blocks: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+            for row, column in cells:
+                blocks.setdefault(
+                    (row // self.block, column // self.block), []
+                ).append((row, column))
+            self._cells.clear()
+            self._cells.update(cells)
+            self._blocks.clear()
+            self._blocks.update(blocks)
+            self._generation[1:] = generation, expires
+            self._stats['loads'] += 1
+
+    def near(
+        self: Self,
+        latitude: float,
+        longitude: float,
+        /,
+        k: int,
+        radius: Optional[float] = None,
+    ) -> List[Tuple[Any, float]]:
+        """Return the keys of the `k` nearest points with their distances.
+
+        Only the points within the `radius` in kilometers are returned, if
+        it is given.
+        """
+        self._stats['searches'] += 1
+        if not self._cells or k <= 0:
+            return []
+
+        # The heap holds the occupied blocks and then their cells by their
+        # least distance, so the empty cells are never visited.
+        size = self.cell * self.block
+        heap: List[Tuple[float, int, int, bool]] = [
+            (
+                self._get_bound(latitude, longitude, row, column, size),
+                row,
+                column,
+                True,
+            )
+            for row, column in self._blocks
+        ]
+        heapify(heap)
+        found: List[Tuple[float, Any]] = []
+        while heap:
+            bound, row, column, block = heappop(heap)
+            if radius is not None and bound > radius:
+                break
+            elif len(found) >= k and found[-1][0] <= bound:
+                break
+            elif block:
+                for _row, _column in self._blocks[row, column]:
+                    heappush(
+                        heap,
+                        (
+                            self._get_bound(
+                                latitude, longitude, _row, _column, self.cell
+                            ),
+                            _row,
+                            _column,
+                            False,
+                        ),
+                    )
+                continue
+
+            self._stats['visits'] += 1
+            for key, _latitude, _longitude in self._cells[row, column]:
+                distance = haversine(
+                    latitude, longitude, _latitude, _longitude
+                )
+                if radius is None or distance <= radius:
+                    found.append((distance, key))
+            found.sort(key=lambda _: _[0])
+            del found[k:]
+        return [(key, distance) for distance, key in found]
+
+    def _get_cell(
+        self: Self, latitude: float, longitude: float, /
+    ) -> Tuple[int, int]:
+        return floor(latitude / self.cell), floor(longitude / self.cell)
+
+    @staticmethod
+    def _get_bound(
+        latitude: float,
+        longitude: float,
+        row: int,
+        column: int,
+        size: float,
+        /,
+    ) -> float:
+        """Return the least distance from the point to the box of the cell.
+
+        The box is nearest either on the meridian of the point, if the box
+        spans it, or on the closer of its meridians, where the distance is
+        the least at the foot of the perpendicular or at the corners.
+        """
+        south, north = max(row * size, -90), min((row + 1) * size, 90)
+        west, east = max(column * size, -180), min((column + 1) * size, 180)
+        if west <= longitude <= east:
+            return max(south - latitude, latitude - north, 0) * DEGREE
+        meridian = min(
+            (west, east), key=lambda _: abs((longitude - _ + 180) % 360 - 180)
+        )
+        delta = radians((longitude - meridian + 180) % 360 - 180)
+        foot = degrees(
+            atan2(sin(radians(latitude)), cos(radians(latitude)) * cos(delta))
+        )
+        return min(
+            haversine(latitude, longitude, _, meridian)
+            for _ in (south, north, *((foot,) if south < foot < north else ()))
+        ) * (1 - 1e-9)
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(
+            points=sum(map(len, self._cells.values())),
+            cells=len(self._cells),
+            cell=self.cell,
+            stale=self.stale,
+        )
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Final, FrozenSet, Hashable, Optional, Tuple
+
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.schema import Column, Table
+from sqlalchemy.sql.util import find_tables
+from typing_extensions import Self
+
+
+@dataclass(init=False, frozen=True)
+class StatementPlan(object):
+    """The compiled statement for a single query shape.
+
+    Every filter value of the query is represented by a bound parameter, so
+    the same statement object is reused for all the queries of the same shape
+    and only the parameters have to be recomputed. The `keys` are the columns
+    of the keyset used for the cursor pagination, if any. The rows of the
+    `named` plans are returned as mappings of the projected fields. The
+    `tables` are all the tables the statement reads from or `loads` the
+    relationships from, unless the result depends on others.
+    """
+
+    statement: Final[Executable]
+    raw: Final[bool]
+    bindings: Final[Tuple[Optional[Tuple[str, Optional[Column]]], ...]]
+    keys: Final[Tuple[Tuple[Column, bool, str], ...]]
+    named: Final[bool]
+    tables: Final[FrozenSet[Table]]
+
+    def __init__(
+        self: Self,
+        /,
+        statement: Executable,
+        raw: bool,
+        bindings: Tuple[Optional[Tuple[str, Optional[Column]]], ...],
+        keys: Tuple[Tuple[Column, bool, str], ...] = (),
+        *,
+        named: bool = False,
+        tables: Optional[FrozenSet[Table]] = None,
+        loads: FrozenSet[Table] = frozenset(),
+    ) -> None:
+        object.__setattr__(self, 'statement', statement)
+        object.__setattr__(self, 'raw', raw)
+        object.__setattr__(self, 'bindings', bindings)
+        object.__setattr__(self, 'keys', keys)
+        object.__setattr__(self, 'named', named)
+        object.__setattr__(
+            self,
+            'tables',
+            tables
+            if tables is not None
+            else frozenset(
+                table
+                for _ in find_tables(
+                    statement, include_aliases=True, include_joins=True
+                )
+                if isinstance(table := getattr(_, 'element', _), Table)
+            )
+            | loads,
+        )
+
+
+@dataclass(init=False, frozen=True)
+class PlanCache(object):
+    """The LRU cache of the :class:`StatementPlan` keyed by the query shape."""
+
+    maxsize: Final[int]
+    _plans: Final['OrderedDict[Hashable, StatementPlan]']
+    _stats: Final[Dict[str, int]]
+
+    def __init__(self: Self, /, maxsize: int = 512) -> None:
+        object.__setattr__(self, 'maxsize', maxsize)
+        object.__setattr__(self, '_plans', OrderedDict())
+        object.__setattr__(self, '_stats', dict(hits=0, misses=0, evictions=0))
+
+    def get(self: Self, key: Hashable, /) -> Optional[StatementPlan]:
+        if (plan := self._plans.get(key)) is None:
+            self._stats['misses'] += 1
+            return None
+        self._plans.move_to_end(key)
+        self._stats['hits'] += 1
+        return plan
+
+    def set(
+        self: Self, key: Hashable, plan: StatementPlan, /
+    ) -> StatementPlan:
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+            self._stats['evictions'] += 1
+        return plan
+
+    def clear(self: Self, /) -> None:
+        self._plans.clear()
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(size=len(self._plans), maxsize=self.maxsize)
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import (
+    Any,
+    Dict,
+    Final,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Set,
+)
+
+from sqlalchemy.sql.schema import Table
+from starlette.responses import Response
+from typing_extensions import Self
+
+
+@dataclass(init=False, frozen=True)
+class CachedResponse(object):
+    """The encoded body of the response with the tables it was read from."""
+
+    body: Final[bytes]
+    status_code: Final[int]
+    media_type: Final[Optional[str]]
+    headers: Final[Mapping[str, str]]
+    tables: Final[FrozenSet[Table]]
+    expires: Final[float]
+
+    def __init__(
+        self: Self,
+        /,
+        response: Response,
+        tables: FrozenSet[Table],
+        expires: float,
+    ) -> None:
+        object.__setattr__(self, 'body', response.body)
+        object.__setattr__(self, 'status_code', response.status_code)
+        object.__setattr__(self, 'media_type', response.media_type)
+        object.__setattr__(
+            self,
+            'headers',
+            {
+                key: value
+                for key, value in response.headers.items()
+                if key not in {'content-length', 'content-type'}
+            },
+        )
+        object.__setattr__(self, 'tables', tables)
+        object.__setattr__(self, 'expires', expires)
+
+    def to_response(self: Self, /) -> Response:
+        return Response(
+            self.body,
+            self.status_code,
+            self.headers,
+            self.media_type,
+        )
+
+
+@dataclass(init=False, frozen=True)
+class ResponseCache(object):
+    """The LRU cache of the encoded responses expiring after `ttl` seconds.
+
+    The responses are tagged with the tables they were read from, so a write
+    to any of them invalidates only the responses that could have changed.
+    Every invalidation advances the generations of the tables, so a response
+    read before is not stored after it.
+    """
+
+    maxsize: Final[int]
+    ttl: Final[float]
+    _responses: Final['OrderedDict[Hashable, CachedResponse]']
+    _tables: Final[Dict[Table, Set[Hashable]]]
+    _generations: Final[Dict[Table, int]]
+    _stats: Final[Dict[str, int]]
+
+    def __init__(
+        self: Self,
+        /,
+        maxsize: int = 1024,
+        ttl: float = 60,
+    ) -> None:
+        object.__setattr__(self, 'maxsize', maxsize)
+        object.__setattr__(self, 'ttl', ttl)
+        object.__setattr__(self, '_responses', OrderedDict())
+        object.__setattr__(self, '_tables', {})
+        object.__setattr__(self, '_generations', {})
+        object.__setattr__(
+            self,
+            '_stats',
+            dict(hits=0, misses=0, evictions=0, invalidations=0, stale=0),
+        )
+
+    @property
+    def enabled(self: Self, /) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self: Self, key: Hashable, /) -> Optional[Response]:
+        if (cached := self._responses.get(key)) is None:
+            self._stats['misses'] += 1
+            return None
+        elif cached.expires <= monotonic():
+            self._pop(key)
+            self._stats['misses'] += 1
+            return None
+        self._responses.move_to_end(key)
+        self._stats['hits'] += 1
+        return cached.to_response()
+
+    def get_generation(self: Self, tables: Iterable[Table], /) -> int:
+        return sum(self._generations.get(table, 0) for table in tables)
+
+    def set(
+        self: Self,
+        key: Hashable,
+        response: Response,
+        /,
+        tables: FrozenSet[Table],
+        generation: Optional[int] = None,
+    ) -> Response:
+        if not self.enabled:
+            return response
+        elif generation is not None and generation != self.get_generation(
+            tables
+        ):
+            self._stats['stale'] += 1
+            return response
+        elif key in self._responses:
+            self._pop(key)
+        self._responses[key] = CachedResponse(
+            response, tables, monotonic() + self.ttl
+        )
+        for table in tables:
+            self._tables.setdefault(table, set()).add(key)
+        while len(self._responses) > self.maxsize:
+            self._pop(next(iter(self._responses)))
+            self._stats['evictions'] += 1
+        return response
+
+    def invalidate(self: Self, tables: Iterable[Table], /) -> None:
+        for table in tables:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            for key in self._tables.pop(table, ()):
+                if key in self._responses:
+                    self._pop(key)
+                    self._stats['invalidations'] += 1
+
+    def clear(self: Self, /) -> None:
+        self._responses.clear()
+        self._tables.clear()
+
+    def _pop(self: Self, key: Hashable, /) -> None:
+        for table in self._responses.pop(key).tables:
+            if (keys := self._tables.get(table)) is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tables[table]
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(
+            size=len(self._responses), maxsize=self.maxsize, ttl=self.ttl
+        )
@@ -0,0 +1,222 @@
+from csv import writer
+from datetime import date, datetime, time
+from decimal import Decimal
+from io import BytesIO, StringIO
+from typing import Any, Dict, Final, Iterable, List, Optional, Tuple, Type
+
+from fastapi.exceptions import HTTPException
+from orjson import dumps
+from starlette.responses import Response
+from starlette.status import HTTP_406_NOT_ACCEPTABLE
+from typing_extensions import Self
+
+from ..models.base_interface import BaseInterface, serialize
+
+
+def _get_records(
+    content: Iterable[Any],
+    /,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    columns: Dict[str, None] = {}
+    records: List[Dict[str, Any]] = []
+    for item in content:
+        if isinstance(item, BaseInterface):
+            item = serialize(item)
+        elif not isinstance(item, dict):
+            raise TypeError(f'Record should be a dictionary: {item}')
+        columns.update(dict.fromkeys(item))
+        records.append(item)
+    return list(columns), records
+
+
+class RecordsResponse(Response):
+    """The response rendering the content as the named records."""
+
+    def render(self: Self, content: Any, /) -> bytes:
+        return self.render_records(*_get_records(content))
+
+    def render_records(
+        self: Self,
+        columns: List[str],
+        records: List[Dict[str, Any]],
+        /,
+    ) -> bytes:
+        raise NotImplementedError
+
+
+class NDJSONResponse(Response):
+    media_type: Final[str] = 'application/x-ndjson'
+
+    def render(self: Self, content: Any, /) -> bytes:
+        return self.render_chunk(content, first=True)
+
+    @classmethod
+    def render_chunk(
+        cls: Type[Self],
+        content: Iterable[Any],
+        /,
+        *,
+        first: bool,
+    ) -> bytes:
+        return b''.join(dumps(_, default=serialize) + b'\n' for _ in content)
+
+
+class CSVResponse(RecordsResponse):
+    media_type: Final[str] = 'text/csv'
+
+    def render_records(
+        self: Self,
+        columns: List[str],
+        records: List[Dict[str, Any]],
+        /,
+    ) -> bytes:
+        return self._render_rows(columns, records, header=True)
+
+    @classmethod
+    def render_chunk(
+        cls: Type[Self],
+        content: Iterable[Any],
+        /,
+        *,
+        first: bool,
+    ) -> bytes:
+        return cls._render_rows(*_get_records(content), header=first)
+
+    @staticmethod
+    def _render_rows(
+        columns: List[str],
+        records: List[Dict[str, Any]],
+        /,
+        *,
+        header: bool,
+    ) -> bytes:
+        buffer = StringIO()
+        csv = writer(buffer)
+        if header:
+            csv.writerow(columns)
+        for record in records:
+            row = []
+            for value in map(record.get, columns):
+                if value is None:
+                    value = ''
+                elif isinstance(value, (dict, list)):
+                    value = dumps(value, default=serialize).decode()
+                elif isinstance(value, (date, time, datetime)):
+                    value = value.isoformat()
+                row.append(value)
+            csv.writerow(row)
+        return buffer.getvalue().encode(CSVResponse.charset)
+
+
+class ColumnsJSONResponse(RecordsResponse):
+    media_type: Final[str] = 'application/vnd.sort.columns+json'
+
+    def render_records(
+        self: Self,
+        columns: List[str],
+        records: List[Dict[str, Any]],
+        /,
+    ) -> bytes:
+        return dumps(
+            dict(
+                columns=columns,
+                rows=[list(map(_.get, columns)) for _ in records],
+            ),
+            default=serialize,
+        )
+
+
+class MessagePackResponse(Response):
+    media_type: Final[str] = 'application/msgpack'
+
+    def render(self: Self, content: Any, /) -> bytes:
+        try:
+            from msgpack import packb
+        except ImportError as _:
+            raise HTTPException(
+                HTTP_406_NOT_ACCEPTABLE, 'MessagePack is not available.'
+            ) from _
+        return packb(content, default=serialize)
+
+
+class ArrowResponse(RecordsResponse):
+    media_type: Final[str] = 'application/vnd.apache.arrow.stream'
+
+    def render_records(
+        self: Self,
+        columns: List[str],
+        records: List[Dict[str, Any]],
+        /,
+    ) -> bytes:
+        try:
+            from pyarrow import Table
+            from pyarrow.ipc import new_stream
+        except ImportError as _:
+            raise HTTPException(
+                HTTP_406_NOT_ACCEPTABLE, 'Apache Arrow is not available.'
+            ) from _
+
+        table = Table.from_pylist(
+            [
+                {key: self._get_value(value) for key, value in record.items()}
+                for record in records
+            ]
+        )
+        sink = BytesIO()
+        with new_stream(sink, table.schema) as stream:
+            stream.write_table(table)
+        return sink.getvalue()
+
+    @staticmethod
+    def _get_value(value: Any, /) -> Any:
+        # The nested values are encoded as JSON and the scalars without an
+        # Arrow type are serialized, as the UUIDs into strings.
+        if value is None or isinstance(
+            value, (bool, int, float, str, bytes, date, time, datetime)
+        ):
+            return value
+        elif isinstance(value, Decimal):
+            return float(value)
+        elif isinstance(value, (dict, list, tuple)):
+            return dumps(value, default=serialize).decode()
+        elif isinstance(value := serialize(value), (dict, list)):
+            return dumps(value).decode()
+        return value
+
+
+MediaTypes: Final[Dict[str, Type[Response]]] = {
+    'application/x-ndjson': NDJSONResponse,
+    'application/ndjson': NDJSONResponse,
+    'text/csv': CSVResponse,
+    'application/vnd.sort.columns+json': ColumnsJSONResponse,
+    'application/msgpack': MessagePackResponse,
+    'application/x-msgpack': MessagePackResponse,
+    'application/vnd.apache.arrow.stream': ArrowResponse,
+}
+
+
+def negotiate(
+    accept: str,
+    /,
+    default: Type[Response],
+) -> Type[Response]:
+    media_types: List[Tuple[float, int, str]] = []
+    for index, media_range in enumerate(accept.split(',')):
+        media_type, *params = media_range.split(';')
+        quality: Optional[float] = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = None
+        if quality:
+            media_types.append((-quality, index, media_type.strip().lower()))
+
+    for _, _, media_type in sorted(media_types):
+        if media_type in MediaTypes:
+            return MediaTypes[media_type]
+        elif media_type in {'application/json', 'application/*', '*/*'}:
+            return default
+    return default
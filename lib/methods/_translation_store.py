@@ -0,0 +1,210 @@
+from asyncio import Lock
+from dataclasses import dataclass
+from gzip import compress
+from hashlib import blake2b
+from time import monotonic
+from typing import Any, Dict, Final, FrozenSet, List, Optional, Tuple
+
+from orjson import OPT_SORT_KEYS, dumps
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from sqlalchemy.sql.expression import select
+from sqlalchemy.sql.schema import Table
+from typing_extensions import Self
+
+#
+Locale = Tuple[str, str]
+
+
+@dataclass(init=False, frozen=True)
+class TranslationBundle(object):
+    """The encoded translations of a locale with their version."""
+
+    etag: Final[str]
+    body: Final[bytes]
+    compressed: Final[bytes]
+
+    def __init__(self: Self, /, translations: Dict[str, str]) -> None:
+        body = dumps(translations, option=OPT_SORT_KEYS)
+        object.__setattr__(
+            self,
+            'etag',
+            '"%s"' % blake2b(body, digest_size=16).hexdigest(),
+        )
+        object.__setattr__(self, 'body', body)
+        object.__setattr__(self, 'compressed', compress(body, mtime=0))
+
+
+@dataclass(init=False, frozen=True)
+class TranslationStore(object):
+    """The in-memory translations of the `text` in the `text_locales`.
+
+    A text is translated by the first of the chain of its locale, the other
+    locales of the same language, the fallback locale of the `settings` and
+    its own fallback. The bundles of the locales are encoded once and served
+    from memory until a write to any of the tables, or after `ttl` seconds
+    for the writes of the other workers.
+    """
+
+    text: Final[Table]
+    text_locales: Final[Table]
+    locales: Final[Table]
+    settings: Final[Table]
+    ttl: Final[float]
+    _fallbacks: Final[Dict[str, str]]
+    _values: Final[Dict[Tuple[str, Locale], str]]
+    _chains: Final[Dict[Locale, Tuple[Locale, ...]]]
+    _bundles: Final[Dict[Locale, TranslationBundle]]
+    _generation: Final[List[float]]
+    _lock: Final[Lock]
+    _stats: Final[Dict[str, int]]
+
+    def __init__(
+        self: Self,
+        /,
+        text: Table,
+        text_locales: Table,
+        locales: Table,
+        settings: Table,
+        *,
+        ttl: float = 300,
+    ) -> None:
+        object.__setattr__(self, 'text', text)
+        object.__setattr__(self, 'text_locales', text_locales)
+        object.__setattr__(self, 'locales', locales)
+        object.__setattr__(self, 'settings', settings)
+        object.__setattr__(self, 'ttl', ttl)
+        object.__setattr__(self, '_fallbacks', {})
+        object.__setattr__(self, '_values', {})
+        object.__setattr__(self, '_chains', {})
+        object.__setattr__(self, '_bundles', {})
+        # The generations of the tables and of the loaded translations with
+        # the time the translations expire.
+        object.__setattr__(self, '_generation', [1, 0, 0.0])
+        object.__setattr__(self, '_lock', Lock())
+        object.__setattr__(self, '_stats', dict(loads=0, hits=0, misses=0))
+
+    @staticmethod
+    def parse_locale(locale: str, /) -> Optional[Locale]:
+        language, _, country = locale.replace('_', '-').partition('-')
+        if len(language) == len(country) == 2:
+            return language.lower(), country.lower()
+        return None
+
+    def invalidate(self: Self, tables: FrozenSet[Table], /) -> None:
+        if not tables.isdisjoint(
+            {self.text, self.text_locales, self.locales, self.settings}
+        ):
+            self._generation[0] += 1
+
+    @property
+    def stale(self: Self, /) -> bool:
+        return (
+            self._generation[0] != self._generation[1]
+            or self._generation[2] <= monotonic()
+        )
+
+    async def load(self: Self, engine: AsyncEngine, /) -> None:
+        if not self.stale:
+            return
+        async with self._lock:
+            if not self.stale:
+                return
+            generation, expires = self._generation[0], monotonic() + self.ttl
+            async with engine.connect() as connection:
+                fallbacks = dict(
+                    (
+                        await connection.execute(
+                            select(self.text.c.key, self.text.c.fallback)
+                        )
+                    ).all()
+                )
+                values = {
+                    (key, (language.lower(), country.lower())): value
+                    for key, language, country, value in (
+                        await connection.execute(
+                            select(
+                                self.text_locales.c.text_key,
+                                self.text_locales.c.locale_language_code,
+                                self.text_locales.c.locale_country_code,
+                                self.text_locales.c.value,
+                            )
+                        )
+                    ).all()
+                }
+                locales = [
+                    (language.lower(), country.lower())
+                    for language, country in (
+                        await connection.execute(
+                            select(
+                                self.locales.c.language_code,
+                                self.locales.c.country_code,
+                            ).order_by(
+                                self.locales.c.language_code,
+                                self.locales.c.country_code,
+                            )
+                        )
+                    ).all()
+                ]
+                default = (
+                    await connection.execute(
+                        select(
+                            self.settings.c.fallback_locale_language_code,
+                            self.settings.c.fallback_locale_country_code,
+                        )
+                    )
+                ).first()
+
+            default = (
+                (default[0].lower(), default[1].lower())
+                if default is not None and None not in default
+                else None
+            )
+            chains: Dict[Locale, Tuple[Locale, ...]] = {}
+            for locale in locales:
+                chain = dict.fromkeys(
+                    (
+                        locale,
+                        *(_ for _ in locales if _[0] == locale[0]),
+                        *((default,) if default is not None else ()),
+                    )
+                )
+                chains[locale] = tuple(chain)
+
+            self._fallbacks.clear()
+            self._fallbacks.update(fallbacks)
+            self._values.clear()
+            self._values.update(values)
+            self._chains.clear()
+            self._chains.update(chains)
+            self._bundles.clear()
+            self._generation[1:] = generation, expires
+            self._stats['loads'] += 1
+
+    def get(self: Self, key: str, locale: Locale, /) -> Optional[str]:
+        for _locale in self._chains.get(locale, ()):
+            if (value := self._values.get((key, _locale))) is not None:
+                return value
+        return self._fallbacks.get(key)
+
+    def get_bundle(
+        self: Self, locale: Locale, /
+    ) -> Optional[TranslationBundle]:
+        if (bundle := self._bundles.get(locale)) is not None:
+            self._stats['hits'] += 1
+            return bundle
+        elif locale not in self._chains:
+            return None
+        self._stats['misses'] += 1
+        bundle = self._bundles[locale] = TranslationBundle(
+            {key: self.get(key, locale) for key in self._fallbacks}
+        )
+        return bundle
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(
+            texts=len(self._fallbacks),
+            values=len(self._values),
+            bundles=len(self._bundles),
+            stale=self.stale,
+        )
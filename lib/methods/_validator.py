@@ -0,0 +1,257 @@
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from inspect import isclass
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Final,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from dateutil.parser import isoparse
+from fastapi.exceptions import HTTPException
+from sqlalchemy.sql.schema import Column, Table
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+from typing_extensions import Self
+
+from ..models.base_interface import BaseInterface
+
+Converter = Callable[[Any], Any]
+
+_converters: Final[Dict[type, Converter]] = {
+    date: lambda value: isoparse(value).date(),
+    time: lambda value: isoparse(value).time(),
+    datetime: isoparse,
+    timedelta: lambda value: timedelta(seconds=value)
+    if isinstance(value, (int, float))
+    else value,
+    Decimal: lambda value: Decimal(str(value))
+    if isinstance(value, (str, int, float))
+    else value,
+}
+
+
+def _get_converter(column: Column, /) -> Optional[Converter]:
+    python_type = None
+    with suppress(NotImplementedError):
+        python_type = column.type.python_type
+    if (converter := _converters.get(python_type)) is None:
+        return None
+
+    def convert(value: Any, /) -> Any:
+        if value is None or isinstance(value, python_type):
+            return value
+        try:
+            return converter(value)
+        except (ValueError, TypeError, ArithmeticError) as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                f'Field `{column.key}` has an invalid value: {value!r}.',
+            ) from _
+
+    return convert
+
+
+@dataclass(init=False, frozen=True)
+class ModelValidator(object):
+    """The precompiled coercion and validation of the input of a model.
+
+    Everything that depends only on the model is computed once: the columns
+    with the converters of their values, the required fields and the models
+    of the relationships, so validating an item only costs the conversion of
+    its values.
+    """
+
+    model: Final[Union[Type[BaseInterface], Table]]
+    name: Final[str]
+    columns: Final[Dict[str, Tuple[Column, Optional[Converter]]]]
+    required: Final[FrozenSet[str]]
+    required_message: Final[str]
+    skipped: Final[FrozenSet[str]]
+    relationships: Final[Optional[Dict[str, Optional[Type[BaseInterface]]]]]
+
+    _validators: ClassVar[Dict[Any, 'ModelValidator']] = {}
+    Skipped: ClassVar[FrozenSet[str]] = frozenset({'created_at', 'updated_at'})
+
+    def __init__(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        /,
+    ) -> None:
+        object.__setattr__(self, 'model', model)
+        object.__setattr__(
+            self,
+            'name',
+            model.name if isinstance(model, Table) else model.__tablename__,
+        )
+        object.__setattr__(
+            self,
+            'columns',
+            {_.key: (_, _get_converter(_)) for _ in model.columns if _.key},
+        )
+        object.__setattr__(
+            self,
+            'required',
+            frozenset(
+                column.key
+                for column, _ in self.columns.values()
+                if column.default is None
+                and not column.nullable
+                and column.autoincrement is not True
+            ),
+        )
+        object.__setattr__(
+            self,
+            'required_message',
+            'Table `{name}` requires fields: {fields}.'.format(
+                name=self.name,
+                fields=', '.join(
+                    f'`{key}`' for key in self.columns if key in self.required
+                ),
+            ),
+        )
+        # The sums maintained by the triggers are never written directly.
+        object.__setattr__(
+            self,
+            'skipped',
+            self.Skipped.union(
+                key
+                for key, (column, _) in self.columns.items()
+                if column.info.get('sums')
+            ),
+        )
+        relationships = None
+        if isclass(model) and issubclass(model, BaseInterface):
+            relationships = {}
+            for relationship in model.relationships:
+                if relationship.key:
+                    try:
+                        relationships[
+                            relationship.key
+                        ] = relationship.entity.class_
+                    except AttributeError:
+                        relationships[relationship.key] = None
+        object.__setattr__(self, 'relationships', relationships)
+
+    @classmethod
+    def get(
+        cls: Type[Self],
+        model: Union[Type[BaseInterface], Table],
+        /,
+    ) -> Self:
+        if (validator := cls._validators.get(model)) is None:
+            validator = cls._validators[model] = cls(model)
+        return validator
+
+    def get_row(
+        self: Self, item: Dict[str, Any], /
+    ) -> Optional[Dict[str, Any]]:
+        """Validate the flat `item` as a row of the table.
+
+        Returns:
+            The row without the empty values or None if the `item` has
+            nested relationships.
+        """
+        row: Dict[str, Any] = {}
+        for field, value in item.items():
+            if (entry := self.columns.get(field)) is not None:
+                if value is not None and field not in self.skipped:
+                    row[field] = value if entry[1] is None else entry[1](value)
+            elif self.relationships is not None and (
+                field in self.relationships
+            ):
+                if value:
+                    return None
+            else:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f"Field '{field}' is not present in the "
+                    f"'{self.name}' table.",
+                )
+        if not self.required.issubset(row):
+            raise HTTPException(HTTP_400_BAD_REQUEST, self.required_message)
+        return row
+
+    def get_item(
+        self: Self,
+        item: Union[Dict[str, Any], List[Dict[str, Any]]],
+        /,
+        field_chain: Tuple[str, ...] = (),
+    ) -> Any:
+        """Validate the `item` and build the instances of the model from it.
+
+        The nested relationships are validated by the validators of their
+        own models. The required fields are checked only for the root items
+        since the nested ones may get them from their parents.
+        """
+        if isinstance(item, dict):
+            values = dict.fromkeys(self.columns)
+            for field, value in item.items():
+                if (entry := self.columns.get(field)) is not None:
+                    if field not in self.skipped:
+                        values[field] = (
+                            value if entry[1] is None else entry[1](value)
+                        )
+                elif self.relationships is None:
+                    raise HTTPException(
+                        HTTP_500_INTERNAL_SERVER_ERROR,
+                        f"Mapper for table '{self.name}' is not present.",
+                    )
+                elif field in self.relationships:
+                    if not value:
+                        continue
+                    elif (model := self.relationships[field]) is None:
+                        raise HTTPException(
+                            HTTP_500_INTERNAL_SERVER_ERROR,
+                            'Could not infer type for relationship: '
+                            f'{self.model.__name__}.{field}',
+                        )
+                    values[field] = self.get(model).get_item(
+                        value, (*field_chain, field)
+                    )
+                else:
+                    raise HTTPException(
+                        HTTP_400_BAD_REQUEST,
+                        f"Field '{field}' is not present in the "
+                        f"'{self.name}' table.",
+                    )
+            for field in self.skipped.intersection(values):
+                del values[field]
+            if not field_chain and any(
+                values[_] is None for _ in self.required
+            ):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST, self.required_message
+                )
+            return self.model(**values)
+
+        elif item:
+            items = []
+            for index, item in enumerate(item):
+                if not isinstance(item, dict):
+                    raise HTTPException(
+                        HTTP_400_BAD_REQUEST,
+                        f'%s element #{index} should be a dictionary.'
+                        % ('.'.join(field_chain) or 'Root'),
+                    )
+                items.append(self.get_item(item, field_chain))
+            return items
+
+
+def compile_validators(base: Type[BaseInterface], /) -> None:
+    """Compile the validators of all the mapped classes of the `base`."""
+    for mapper in base.registry.mappers:
+        if issubclass(mapper.class_, BaseInterface):
+            ModelValidator.get(mapper.class_)
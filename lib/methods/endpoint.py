@@ -1,42 +1,79 @@
 from ast import operator
-from contextlib import suppress
+from asyncio import (
+    BoundedSemaphore,
+    CancelledError,
+    Lock,
+    Semaphore,
+    create_task,
+    gather,
+    get_running_loop,
+    shield,
+)
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from contextlib import nullcontext, suppress
 from dataclasses import dataclass
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
 from inspect import isclass
 from operator import eq, ge, gt, le, lt, ne
 from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
     ClassVar,
     Dict,
     Final,
+    FrozenSet,
+    Hashable,
     Iterable,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
 )
-from urllib.parse import unquote
+from urllib.parse import quote, unquote
 
 from dateutil.parser import isoparse
 from fastapi.applications import FastAPI
 from fastapi.exceptions import HTTPException
 from fastapi.responses import ORJSONResponse
-from orjson import loads
+from orjson import dumps, loads
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from sqlalchemy.ext.asyncio.scoping import async_scoped_session
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.orm.relationships import RelationshipProperty
-from sqlalchemy.sql.expression import and_, delete, or_, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.expression import (
+    and_,
+    bindparam,
+    delete,
+    exists,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+)
 from sqlalchemy.sql.functions import count as sa_count
 from sqlalchemy.sql.functions import func
+from sqlalchemy.sql.operators import desc_op
 from sqlalchemy.sql.schema import Column, ColumnClause, MetaData, Table
+from sqlalchemy.sql.selectable import FromClause, Join, Select
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 from starlette.status import (
     HTTP_204_NO_CONTENT,
     HTTP_304_NOT_MODIFIED,
@@ -45,7 +82,17 @@ from starlette.status import (
 )
 from typing_extensions import Self
 
-from ..models.base_interface import BaseInterface
+from ..middleware.replica_routing_middleware import ReplicaRoutingMiddleware
+from ..models._mixins import Counted, Rollup
+from ..models.base_interface import BaseInterface, serialize
+from ..models.misc.row_count_model import RowCountModel
+from ..models.misc.settings_model import SettingsModel
+from ._explain import Explain
+from ._geo_index import GeoIndex
+from ._plan_cache import PlanCache, StatementPlan
+from ._response_cache import ResponseCache
+from ._responses import NDJSONResponse, RecordsResponse, negotiate
+from ._validator import ModelValidator
 
 
 def _get_keys(
@@ -67,6 +114,36 @@ async def endpoint_info(request: Request, /) -> Response:
     return await EndPoint(request).info()
 
 
+async def endpoint_batch(request: Request, /) -> Response:
+    return await EndPoint(request).batch()
+
+
+async def endpoint_near(request: Request, /) -> Response:
+    return await EndPoint(request).near()
+
+
+async def endpoint_rollup(request: Request, /) -> Response:
+    return await EndPoint(request).rollup()
+
+
+async def endpoint_stats(request: Request, /) -> Response:
+    return ORJSONResponse(
+        dict(
+            plans=EndPointStatementBuilder._plans.stats,
+            pool=getattr(request.get('pool_manager'), 'stats', None),
+            rollups=getattr(request.get('rollup_refresher'), 'stats', None),
+            translations=getattr(
+                request.get('translation_store'), 'stats', None
+            ),
+            replicas=getattr(request.get('replicas'), 'stats', None),
+            responses=EndPoint.response_cache.stats,
+            flights=EndPoint._flights_stats
+            | dict(size=len(EndPoint._flights)),
+            geo=getattr(EndPoint.geo_index, 'stats', None),
+        )
+    )
+
+
 @dataclass(init=False, frozen=True)
 class EndPoint(object):
 
@@ -75,6 +152,7 @@ class EndPoint(object):
     engine: Final[AsyncEngine]
     Session: Final[async_scoped_session]
     metadata: Final[MetaData]
+    router: Final[Optional[ReplicaRoutingMiddleware]]
 
     if TYPE_CHECKING:
         from sqlalchemy.orm.decl_api import _DeclarativeBase
@@ -82,6 +160,23 @@ class EndPoint(object):
         Base: Final[Type[_DeclarativeBase]]
 
     _tables_registry: ClassVar[Dict[str, Union[Table, BaseInterface]]] = {}
+    stream_chunk_size: ClassVar[int] = 500
+    copy_threshold: ClassVar[int] = 1000
+    ingest_chunk_size: ClassVar[int] = 1000
+    batch_size: ClassVar[int] = 64
+    batch_concurrency: ClassVar[int] = 4
+    near_size: ClassVar[int] = 100
+    geo_index: ClassVar[Optional[GeoIndex]] = None
+    response_cache: ClassVar[ResponseCache] = ResponseCache()
+    write_listeners: ClassVar[List[Callable[[FrozenSet[Table]], Any]]] = []
+    _linked_tables: ClassVar[Dict[Table, FrozenSet[Table]]] = {}
+    _flights: ClassVar[Dict[Hashable, List[Any]]] = {}
+    _batch_slots: ClassVar[
+        Dict[AsyncEngine, Tuple[Lock, BoundedSemaphore]]
+    ] = {}
+    _flights_stats: ClassVar[Dict[str, int]] = dict(
+        executions=0, coalesced=0, waiting=0, max_waiters=0
+    )
 
     def __init__(self: Self, request: Request, /) -> None:
         if not isinstance(app := request.get('app'), FastAPI):
@@ -102,20 +197,325 @@ class EndPoint(object):
             raise HTTPException(
                 HTTP_500_INTERNAL_SERVER_ERROR, 'MetaData is not present.'
             )
-        if not isinstance(route := request.path_params.get('route'), str):
-            raise HTTPException(
-                HTTP_500_INTERNAL_SERVER_ERROR, 'Route is not present.'
-            )
         object.__setattr__(self, 'request', request)
         object.__setattr__(self, 'app', app)
         object.__setattr__(self, 'engine', engine)
         object.__setattr__(self, 'Session', Session)
         object.__setattr__(self, 'metadata', metadata)
         object.__setattr__(self, 'Base', request.get('Base'))
+        object.__setattr__(
+            self,
+            'router',
+            router
+            if isinstance(
+                router := request.get('replicas'), ReplicaRoutingMiddleware
+            )
+            else None,
+        )
 
     async def info(self: Self, /) -> Response:
         return Response(str(self.engine.url))
 
+    async def batch(self: Self, /) -> Response:
+        try:
+            entries = loads(await self.request.body())
+            if not isinstance(entries, list) or not entries:
+                raise ValueError
+        except ValueError as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Batch should be a list of entries.'
+            ) from _
+        if len(entries) > self.batch_size:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                f'Batch is limited to {self.batch_size} entries.',
+            )
+
+        reads = []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict) or not isinstance(
+                route := entry.get('route'), str
+            ):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST, f'Batch entry #{index} is invalid.'
+                )
+            elif str(entry.get('method', 'GET')).upper() != 'GET':
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f'Batch entry #{index} should be a GET request.',
+                )
+            elif (model := self._get_model(route.strip('/').lower())) is None:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f'Batch entry #{index} route is not determined.',
+                )
+            options = entry.get('options') or []
+            if isinstance(options, str):
+                options = options.strip('/').split('/')
+            elif not isinstance(options, list):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f'Batch entry #{index} options are invalid.',
+                )
+            limit, offset, count, cursor, stream = self._get_options(
+                [str(_) for _ in options]
+            )
+            if stream:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f'Batch entry #{index} can not be streamed.',
+                )
+            plan, params = EndPointStatementBuilder.select(
+                model,
+                self._get_query(str(entry.get('query') or '').lstrip('?')),
+                limit=limit,
+                offset=offset,
+                count=count,
+                cursor=cursor,
+            )
+            reads.append((plan, params, limit, count, cursor))
+
+        # The reads run concurrently on their own connections, all of them
+        # importing the snapshot of the first one to see the same data. All
+        # the batches share the slots below the size of the pool, so they can
+        # not exhaust it together. Each batch takes all of its slots at once
+        # under the lock, so the batches never wait on each other holding
+        # a part of them, and the reads run on the first connection one by
+        # one if the pool is small.
+        response = self._get_default_response_class()
+        engine = (await self._get_read_session()).session_factory.kw['bind']
+        size = getattr(engine.sync_engine.pool, 'size', None)
+        capacity = (
+            max(size() - 1, 1)
+            if callable(size)
+            else self.batch_concurrency + 1
+        )
+        if (slots := self._batch_slots.get(engine)) is None:
+            slots = self._batch_slots[engine] = (
+                Lock(),
+                BoundedSemaphore(capacity),
+            )
+        connections = min(self.batch_concurrency + 1, len(reads) + 1, capacity)
+        acquired = 0
+        try:
+            async with slots[0]:
+                while acquired < connections:
+                    await slots[1].acquire()
+                    acquired += 1
+            concurrency = connections - 1
+            semaphore = Semaphore(max(concurrency, 1))
+            async with AsyncSession(engine) as leader:
+                await leader.connection(
+                    execution_options=dict(isolation_level='REPEATABLE READ')
+                )
+                snapshot = await leader.scalar(
+                    text('SELECT pg_export_snapshot()')
+                )
+
+                async def read(
+                    plan: StatementPlan,
+                    params: Dict[str, Any],
+                    limit: int,
+                    count: str,
+                    cursor: Optional[list[str]],
+                    /,
+                ) -> bytes:
+                    async with semaphore, (
+                        AsyncSession(engine)
+                        if concurrency > 0
+                        else nullcontext(leader)
+                    ) as session:
+                        if session is not leader:
+                            await session.connection(
+                                execution_options=dict(
+                                    isolation_level='REPEATABLE READ'
+                                )
+                            )
+                            await session.execute(
+                                text(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+                            )
+                        try:
+                            result = await self._read(
+                                session,
+                                plan,
+                                params,
+                                response,
+                                limit=limit,
+                                count=count,
+                                cursor=cursor,
+                            )
+                        except HTTPException as _:
+                            return dumps(
+                                dict(status=_.status_code, detail=_.detail)
+                            )
+                        return b'{"status":%d,"body":%s%s}' % (
+                            result.status_code,
+                            result.body,
+                            b',"cursor":%s' % dumps(token)
+                            if (token := result.headers.get('X-Next-Cursor'))
+                            else b'',
+                        )
+
+                # The other reads are cancelled on the first failure.
+                tasks = [create_task(read(*_)) for _ in reads]
+                try:
+                    results = await gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    await gather(*tasks, return_exceptions=True)
+                    raise
+            return Response(
+                b'[%s]' % b','.join(results), media_type=response.media_type
+            )
+        finally:
+            for _ in range(acquired):
+                slots[1].release()
+
+    async def near(self: Self, /) -> Response:
+        if self.geo_index is None:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Geo index is not configured.'
+            )
+        query = self.request.query_params
+        try:
+            latitude, longitude = float(query['lat']), float(query['lon'])
+        except (KeyError, ValueError) as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Coordinates are invalid.'
+            ) from _
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Coordinates are invalid.'
+            )
+        k = query.get('k', '10')
+        if not k.isdecimal() or not 0 < int(k) <= self.near_size:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                f'K should be between 1 and {self.near_size}.',
+            )
+        try:
+            radius = float(query['radius']) if query.get('radius') else None
+        except ValueError as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Radius is invalid.'
+            ) from _
+
+        await self.geo_index.load(self.Session)
+        found = dict(self.geo_index.near(latitude, longitude, int(k), radius))
+        response = self._get_default_response_class()
+        if not found:
+            return response([])
+
+        # The rest of the query filters the nearest points and loads their
+        # relationships, e.g. `tanks` of the containers for their status.
+        model = self._get_model(self.geo_index.table.name.lower())
+        plan, params = EndPointStatementBuilder.select(
+            model,
+            '&'.join(
+                _
+                for _ in self.request.url.query.split('&')
+                if _.partition('=')[0] not in {'lat', 'lon', 'k', 'radius'}
+            ),
+        )
+        if plan.raw or plan.named:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Projections are not supported.'
+            )
+        Session = await self._get_read_session()
+        items = await Session.scalars(
+            plan.statement.where(self.geo_index.key.in_(found)), params
+        )
+        items = {getattr(_, self.geo_index.key.key): _ for _ in items}
+        return response(
+            [
+                serialize(items[key]) | dict(distance=distance)
+                for key, distance in found.items()
+                if key in items
+            ]
+        )
+
+    async def rollup(self: Self, /) -> Response:
+        route: Final[str] = self.request.path_params.get('route', '').lower()
+        if not route or (model := self._get_model(route)) is None:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Route is not determined.'
+            )
+        table = getattr(model, '__table__', model)
+        rollups = sorted(
+            (
+                rollup
+                for mapper in (
+                    self.Base.registry.mappers if self.Base is not None else ()
+                )
+                if issubclass(rollup := mapper.class_, Rollup)
+                and rollup.rollup_source is table
+            ),
+            key=lambda _: _.Units[_.rollup_unit],
+            reverse=True,
+        )
+        if not rollups:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Rollup is not determined.'
+            )
+
+        query = self.request.query_params
+        try:
+            start, end = isoparse(query['from']), isoparse(query['to'])
+        except (KeyError, ValueError) as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Range is invalid.'
+            ) from _
+        start, end = (
+            (_ if _.tzinfo else _.replace(tzinfo=timezone.utc)).astimezone(
+                timezone.utc
+            )
+            for _ in (start, end)
+        )
+        if start >= end:
+            raise HTTPException(HTTP_400_BAD_REQUEST, 'Range is invalid.')
+
+        # The coarsest buckets covering exactly the range are read.
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        for rollup in rollups:
+            if query.get('unit', rollup.rollup_unit) != rollup.rollup_unit:
+                continue
+            elif not (start - epoch) % rollup.Units[rollup.rollup_unit] and (
+                not (end - epoch) % rollup.Units[rollup.rollup_unit]
+            ):
+                break
+        else:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                'Range is not aligned to the buckets. Available units: '
+                + ', '.join(f"'{_.rollup_unit}'" for _ in rollups)
+                + '.',
+            )
+
+        plan, params = EndPointStatementBuilder.select(
+            rollup,
+            '&'.join(
+                _
+                for _ in self.request.url.query.split('&')
+                if _.partition('=')[0] not in {'from', 'to', 'unit'}
+            ),
+        )
+        return await self._read(
+            await self._get_read_session(),
+            StatementPlan(
+                plan.statement.where(
+                    rollup.bucket >= start, rollup.bucket < end
+                ),
+                plan.raw,
+                plan.bindings,
+                plan.keys,
+                named=plan.named,
+                tables=plan.tables,
+            ),
+            params,
+            self._get_default_response_class(),
+        )
+
     async def __call__(self: Self, /) -> Response:
         route: Final[str] = self.request.path_params.get('route', '').lower()
         if not route or (model := self._get_model(route)) is None:
@@ -125,15 +525,21 @@ class EndPoint(object):
 
         if self.request.method == 'DELETE':
             async with self.Session.begin():
-                statement = (
-                    EndPointStatementBuilder.delete(model, query)
-                    if (query := self.request.url.query)
-                    else delete(model)
+                plan, params = EndPointStatementBuilder.delete(
+                    model, self.request.url.query
                 )
-                await self.Session.execute(statement)
-            return Response(None, HTTP_204_NO_CONTENT)
+                await self.Session.execute(plan.statement, params)
+            self._notify_write(model)
+            return Response(
+                None, HTTP_204_NO_CONTENT, await self._get_write_headers()
+            )
 
         elif self.request.method in {'POST', 'PUT'}:
+            if 'application/x-ndjson' in self.request.headers.get(
+                'Content-Type', ''
+            ):
+                return await self._ingest(model)
+
             try:
                 body = loads(await self.request.body())
                 if not isinstance(body, Iterable):
@@ -147,74 +553,549 @@ class EndPoint(object):
                     HTTP_400_BAD_REQUEST, 'Body is invalid.'
                 ) from _
 
-            items = []
-            if isinstance(body, dict):
-                items.append(self._modify_item(model, body))
-            elif isinstance(body, Iterable):
-                items.extend(self._modify_item(model, item) for item in body)
             async with self.Session.begin():
-                if self.request.method == 'POST':
-                    for item in items:
-                        self.Session.add(item)
-                else:
-                    for item in items:
-                        await self.Session.merge(item)
-            return Response(None, HTTP_204_NO_CONTENT)
+                await self._write(model, body)
+            self._notify_write(model)
+            return Response(
+                None, HTTP_204_NO_CONTENT, await self._get_write_headers()
+            )
 
         else:
-            limit: int = 0
-            offset: int = 0
-            count: bool = False
-            option1: str = self.request.path_params.get('option1', None)
-            if option1 is not None:
-                if option1.isdecimal():
-                    limit = int(option1)
-                elif option1.lower() == 'count':
-                    count = True
-                elif option1:
+            response = self._get_response_class()
+            query = self._get_query()
+            limit, offset, count, cursor, stream = self._get_options(
+                [
+                    self.request.path_params.get(f'option{_}')
+                    for _ in range(1, 4)
+                ],
+                stream=issubclass(response, NDJSONResponse),
+            )
+            Session = await self._get_read_session()
+            if (
+                stream
+                and not count
+                and cursor is None
+                and (
+                    response is self._get_default_response_class()
+                    or hasattr(response, 'render_chunk')
+                )
+            ):
+                plan, params = EndPointStatementBuilder.select(
+                    model, query, limit=limit, offset=offset
+                )
+                return self._get_streaming_response(
+                    Session(), plan, params, response
+                )
+
+            key = (
+                route,
+                EndPointStatementBuilder.normalize(query),
+                limit,
+                offset,
+                count,
+                None if cursor is None else tuple(cursor),
+                self.request.headers.get('Authorization'),
+                self.request.headers.get('Cookie'),
+                response,
+            )
+            shared = 'X-Session-Token' not in self.request.headers
+            if shared and (cached := self.response_cache.get(key)) is not None:
+                headers = {
+                    name: cached.headers[name]
+                    for name in ('ETag', 'Last-Modified')
+                    if name in cached.headers
+                }
+                if self._is_not_modified(headers):
+                    return Response(None, HTTP_304_NOT_MODIFIED, headers)
+                return cached
+
+            # The response is stored only if none of its tables is written
+            # while it is read.
+            plan, params = EndPointStatementBuilder.select(
+                model,
+                query,
+                limit=limit,
+                offset=offset,
+                count=count,
+                cursor=cursor,
+            )
+            generation = self.response_cache.get_generation(plan.tables)
+
+            # The validators are read only for the conditional requests and
+            # for the responses to be cached, which keep them for the later.
+            headers = {}
+            table = model if isinstance(model, Table) else model.__table__
+            if (
+                not count
+                and 'updated_at' in table.c
+                and (
+                    'If-None-Match' in self.request.headers
+                    or 'If-Modified-Since' in self.request.headers
+                    or shared
+                    and self.response_cache.enabled
+                )
+            ):
+                headers = await self._coalesce(
+                    ('validate', *key) if shared else None,
+                    lambda: self._get_validators(
+                        Session,
+                        model,
+                        key,
+                        limit=limit,
+                        offset=offset,
+                        cursor=cursor,
+                    ),
+                )
+                if self._is_not_modified(headers):
+                    return Response(None, HTTP_304_NOT_MODIFIED, headers)
+
+            async def read() -> Response:
+                result = await self._read(
+                    Session,
+                    plan,
+                    params,
+                    response,
+                    limit=limit,
+                    count=count,
+                    cursor=cursor,
+                )
+                result.headers.update(headers)
+                return self.response_cache.set(
+                    key, result, tables=plan.tables, generation=generation
+                )
+
+            # The concurrent identical requests share a single execution.
+            result = await self._coalesce(
+                ('read', *key) if shared else None, read
+            )
+            return Response(
+                result.body,
+                result.status_code,
+                dict(result.headers),
+                result.media_type,
+            )
+
+    @staticmethod
+    def _get_options(
+        options: Sequence[Optional[str]],
+        /,
+        *,
+        stream: bool = False,
+    ) -> Tuple[int, int, str, Optional[list[str]], bool]:
+        limit: int = 0
+        offset: int = 0
+        count: str = ''
+        cursor: Optional[list[str]] = None
+        option1, option2, option3, *_ = (*options, None, None, None)
+        if option1 is not None:
+            if option1.isdecimal():
+                limit = int(option1)
+            elif option1.lower() == 'count':
+                count = 'exact'
+            elif option1.lower() == 'stream':
+                stream = True
+            elif option1:
+                raise HTTPException(HTTP_400_BAD_REQUEST, 'Limit is invalid.')
+
+            if option2 is not None:
+                if option2.isdecimal():
+                    offset = int(option2)
+                elif option2.lower() == 'count':
+                    count = 'exact'
+                elif (
+                    count
+                    and option2.lower() in EndPointStatementBuilder.CountModes
+                ):
+                    count = option2.lower()
+                elif option2.lower() == 'cursor':
+                    cursor = []
+                elif option2.lower() == 'stream':
+                    stream = True
+                elif option2:
                     raise HTTPException(
-                        HTTP_400_BAD_REQUEST, 'Limit is invalid.'
+                        HTTP_400_BAD_REQUEST, 'Offset is invalid.'
                     )
 
-                option2: str = self.request.path_params.get('option2', None)
-                if option2 is not None:
-                    if option2.isdecimal():
-                        offset = int(option2)
-                    elif option2.lower() == 'count':
-                        count = True
-                    elif option2:
-                        raise HTTPException(
-                            HTTP_400_BAD_REQUEST, 'Offset is invalid.'
+                option3 = option3 or ''
+                if cursor is not None:
+                    if option3:
+                        cursor = EndPointStatementBuilder.decode_cursor(
+                            option3
                         )
+                elif option3.lower() == 'count':
+                    count = 'exact'
+                elif option3.lower() == 'stream':
+                    stream = True
+        return limit, offset, count, cursor, stream
 
-                    option3: str = self.request.path_params.get('option3', '')
-                    if option3.lower() == 'count':
-                        count = True
+    async def _coalesce(
+        self: Self,
+        key: Optional[Hashable],
+        function: Callable[[], Awaitable[Any]],
+        /,
+    ) -> Any:
+        if key is None:
+            return await function()
+        elif (flight := self._flights.get(key)) is not None:
+            flight[1] += 1
+            self._flights_stats['coalesced'] += 1
+            self._flights_stats['waiting'] += 1
+            self._flights_stats['max_waiters'] = max(
+                self._flights_stats['max_waiters'], flight[1]
+            )
+            try:
+                return await shield(flight[0])
+            except CancelledError:
+                if not flight[0].cancelled():
+                    raise
+            finally:
+                self._flights_stats['waiting'] -= 1
+            return await function()
 
-            statement, is_raw = (
-                EndPointStatementBuilder.select(
-                    model, query, limit=limit, offset=offset, count=count
-                )
-                if (query := self.request.url.query)
-                else (select(model), isinstance(model, Table))
+        future = get_running_loop().create_future()
+        self._flights[key] = [future, 0]
+        self._flights_stats['executions'] += 1
+        try:
+            result = await function()
+        except Exception as _:
+            future.set_exception(_)
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    async def _get_validators(
+        self: Self,
+        Session: async_scoped_session,
+        model: Union[Type[BaseInterface], Table],
+        key: Tuple[Any, ...],
+        /,
+        *,
+        limit: int = 0,
+        offset: int = 0,
+        cursor: Optional[list[str]] = None,
+    ) -> Dict[str, str]:
+        # The validators are read before the content, so the content may only
+        # be newer than its validators and never the other way around.
+        plan, params = EndPointStatementBuilder.select(
+            model,
+            self._get_query(),
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            validate=True,
+        )
+        updated_at, total = (
+            await Session.execute(plan.statement, params)
+        ).one()
+        tag = blake2b(
+            dumps(
+                [
+                    repr(key[:-1]),
+                    key[-1].__name__,
+                    None if updated_at is None else updated_at.isoformat(),
+                    total,
+                ]
+            ),
+            digest_size=16,
+        )
+        headers = {'ETag': f'W/"{tag.hexdigest()}"'}
+        if updated_at is not None:
+            headers['Last-Modified'] = format_datetime(
+                updated_at.astimezone(timezone.utc), usegmt=True
             )
-            if count:
-                return Response(str(await self.Session.scalar(statement) or 0))
+        return headers
 
+    def _is_not_modified(self: Self, headers: Dict[str, str], /) -> bool:
+        # The `If-Modified-Since` is weaker, since a timestamp alone does not
+        # change with the deleted rows, so it is used only without the tag.
+        if if_none_match := self.request.headers.get('If-None-Match'):
+            return bool(etag := headers.get('ETag')) and any(
+                _.strip().removeprefix('W/') in {etag.removeprefix('W/'), '*'}
+                for _ in if_none_match.split(',')
+            )
+        elif (last_modified := headers.get('Last-Modified')) and (
+            if_modified_since := self.request.headers.get('If-Modified-Since')
+        ):
             try:
-                response = self._get_response_class()
-                if is_raw:
-                    result = await self.Session.execute(statement)
-                    return response(list(map(list, result.all())))
-                return response((await self.Session.scalars(statement)).all())
-            except TypeError as _:
-                raise HTTPException(
-                    HTTP_500_INTERNAL_SERVER_ERROR,
-                    'Request was valid, but response could not be processed '
-                    'correctly.',
-                ) from _
+                return parsedate_to_datetime(
+                    if_modified_since
+                ) >= parsedate_to_datetime(last_modified)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    async def _read(
+        self: Self,
+        Session: Union[async_scoped_session, AsyncSession],
+        plan: StatementPlan,
+        params: Dict[str, Any],
+        response: Type[Response],
+        /,
+        *,
+        limit: int = 0,
+        count: str = '',
+        cursor: Optional[list[str]] = None,
+    ) -> Response:
+        if count == 'exists':
+            result = await Session.scalar(plan.statement, params)
+            return Response('true' if result else 'false')
+        elif count == 'estimate':
+            result = await Session.scalar(plan.statement, params)
+            if isinstance(result, (str, bytes)):
+                result = loads(result)
+            return Response(str(int(result[0]['Plan']['Plan Rows'])))
+        elif count:
+            return Response(
+                str(await Session.scalar(plan.statement, params) or 0)
+            )
+
+        try:
+            if plan.named or (
+                plan.raw and issubclass(response, RecordsResponse)
+            ):
+                result = await Session.execute(plan.statement, params)
+                return response(list(map(dict, result.mappings())))
+            elif plan.raw:
+                result = await Session.execute(plan.statement, params)
+                return response(list(map(list, result.all())))
+            items = (await Session.scalars(plan.statement, params)).all()
+            if cursor is None:
+                return response(items)
+            return response(
+                items,
+                headers={
+                    'X-Next-Cursor': EndPointStatementBuilder.encode_cursor(
+                        plan, items[-1]
+                    )
+                }
+                if limit and len(items) == limit
+                else None,
+            )
+        except TypeError as _:
+            raise HTTPException(
+                HTTP_500_INTERNAL_SERVER_ERROR,
+                'Request was valid, but response could not be processed '
+                'correctly.',
+            ) from _
+
+    async def _write(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        body: Union[dict[str, Any], list[dict[str, Any]]],
+        /,
+    ) -> None:
+        if rows := self._get_rows(model, body):
+            if self.request.method == 'POST':
+                await self._insert_rows(model, rows)
+            else:
+                await self._upsert_rows(model, rows)
+            return
+
+        items = ModelValidator.get(model).get_item(body)
+        if isinstance(items, BaseInterface):
+            items = [items]
+        if self.request.method == 'POST':
+            for item in items:
+                self.Session.add(item)
+        else:
+            for item in items:
+                await self.Session.merge(item)
+
+    async def _ingest(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        /,
+    ) -> Response:
+        chunk_size = self.request.headers.get('X-Chunk-Size', '')
+        if not chunk_size:
+            chunk_size = self.ingest_chunk_size
+        elif chunk_size.isdecimal() and int(chunk_size):
+            chunk_size = int(chunk_size)
+        else:
+            raise HTTPException(HTTP_400_BAD_REQUEST, 'Chunk size is invalid.')
+
+        chunks: list[dict[str, Any]] = []
+        items: list[dict[str, Any]] = []
+        rejected: int = 0
+        async for line in self._read_lines():
+            try:
+                if not isinstance(item := loads(line), dict):
+                    raise ValueError
+                items.append(item)
+            except ValueError:
+                rejected += 1
+            if len(items) + rejected >= chunk_size:
+                chunks.append(await self._ingest_chunk(model, items, rejected))
+                items, rejected = [], 0
+        if items or rejected:
+            chunks.append(await self._ingest_chunk(model, items, rejected))
+        return self._get_default_response_class()(
+            [dict(chunk=index) | _ for index, _ in enumerate(chunks)],
+            headers=await self._get_write_headers(),
+        )
+
+    async def _ingest_chunk(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        items: list[dict[str, Any]],
+        rejected: int,
+        /,
+    ) -> dict[str, Any]:
+        if not items:
+            return dict(accepted=0, rejected=rejected)
+        try:
+            async with self.Session.begin():
+                await self._write(model, items)
+            self._notify_write(model)
+        except (HTTPException, SQLAlchemyError) as _:
+            return dict(
+                accepted=0,
+                rejected=rejected + len(items),
+                detail=getattr(_, 'detail', None)
+                or str(getattr(_, 'orig', None) or _),
+            )
+        return dict(accepted=len(items), rejected=rejected)
+
+    async def _read_lines(self: Self, /) -> AsyncIterator[bytes]:
+        buffer = b''
+        async for data in self.request.stream():
+            *lines, buffer = (buffer + data).split(b'\n')
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+
+    def _notify_write(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        /,
+    ) -> None:
+        table = model if isinstance(model, Table) else model.__table__
+        if (tables := self._linked_tables.get(table)) is None:
+            tables = self._linked_tables[table] = self._get_linked_tables(
+                table
+            )
+        self.response_cache.invalidate(tables)
+        for listener in self.write_listeners:
+            listener(tables)
+
+    def _get_linked_tables(self: Self, table: Table, /) -> FrozenSet[Table]:
+        # The rows of the dependent tables may change by the cascades, the
+        # referenced tables may be written by the nested relationships and
+        # the others by the triggers maintaining their sums.
+        tables = {table} | {_.column.table for _ in table.foreign_keys}
+        written, writers = {table}, [table]
+        while writers:
+            for _ in writers.pop().info.get('writes', ()):
+                if _ not in written:
+                    written.add(_)
+                    writers.append(_)
+        tables |= written
+        dependents = [table]
+        while dependents:
+            referenced = dependents.pop()
+            for dependent in self.metadata.tables.values():
+                if dependent not in tables and any(
+                    _.column.table is referenced
+                    for _ in dependent.foreign_keys
+                ):
+                    tables.add(dependent)
+                    dependents.append(dependent)
+        return frozenset(tables)
+
+    async def _get_read_session(self: Self, /) -> async_scoped_session:
+        if self.router is None:
+            return self.Session
+        token = self.request.headers.get('X-Session-Token')
+        return await self.router.get_session(token) or self.Session
+
+    async def _get_write_headers(self: Self, /) -> Optional[Dict[str, str]]:
+        if self.router is None or not self.router.replicas:
+            return None
+        return {'X-Session-Token': await self.router.get_token()}
+
+    def _get_streaming_response(
+        self: Self,
+        session: AsyncSession,
+        plan: StatementPlan,
+        params: Dict[str, Any],
+        response: Type[Response],
+        /,
+    ) -> Response:
+        render_chunk = getattr(response, 'render_chunk', None)
+        named = plan.named or (
+            plan.raw and issubclass(response, RecordsResponse)
+        )
+
+        async def content() -> AsyncIterator[bytes]:
+            if named:
+                result = (
+                    await session.stream(plan.statement, params)
+                ).mappings()
+            elif plan.raw:
+                result = await session.stream(plan.statement, params)
+            else:
+                result = await session.stream_scalars(plan.statement, params)
+            try:
+                first = True
+                async for partition in result.partitions(
+                    self.stream_chunk_size
+                ):
+                    items = [
+                        dict(_) if named else list(_) if plan.raw else _
+                        for _ in partition
+                    ]
+                    if render_chunk is not None:
+                        yield render_chunk(items, first=first)
+                    else:
+                        yield (b'[' if first else b',') + b','.join(
+                            dumps(_, default=serialize) for _ in items
+                        )
+                    first = False
+                if render_chunk is None:
+                    yield b'[]' if first else b']'
+            finally:
+                await result.close()
+
+        return StreamingResponse(content(), media_type=response.media_type)
 
     def _get_response_class(self: Self, /) -> Type[Response]:
+        return negotiate(
+            self.request.headers.get('Accept', ''),
+            default=self._get_default_response_class(),
+        )
+
+    def _get_query(self: Self, query: Optional[str] = None, /) -> str:
+        # The empty locale is negotiated from the `Accept-Language`.
+        query = self.request.url.query if query is None else query
+        if 'locale=' not in (entities := query.split('&')):
+            return query
+        accepted: list[Tuple[float, str]] = []
+        for entry in self.request.headers.get('Accept-Language', '').split(
+            ','
+        ):
+            tag, _, weight = entry.partition(';')
+            try:
+                quality = float(weight.strip().removeprefix('q=') or 1)
+            except ValueError:
+                continue
+            language, _, country = tag.strip().partition('-')
+            if quality > 0 and len(language) == len(country) == 2:
+                accepted.append((-quality, f'{language}-{country}'))
+        locale = min(accepted, key=lambda _: _[0])[1] if accepted else '*'
+        return '&'.join(
+            f'locale={locale}' if _ == 'locale=' else _ for _ in entities
+        )
+
+    def _get_default_response_class(self: Self, /) -> Type[Response]:
         return (
             getattr(self.app.router, 'default_response_class', None)
             or ORJSONResponse
@@ -250,95 +1131,119 @@ class EndPoint(object):
                 return None
         return self.__class__._tables_registry[route]
 
-    def _modify_item(
+    def _get_rows(
         self: Self,
         model: Union[Type[BaseInterface], Table],
-        item: Union[dict[str, Any], list[dict[str, Any]]],
+        body: Union[dict[str, Any], list[dict[str, Any]]],
         /,
-        field_chain: tuple[str, ...] = (),
-    ) -> dict[str, Any]:
-        column_keys, relationship_keys = _get_keys(model)
-        if isinstance(item, dict):
-            item = dict.fromkeys(column_keys) | item
-            for field, value in dict(item).items():
-                if field in column_keys:
-                    if field in {'created_at', 'updated_at'}:
-                        del item[field]
-                        continue
-                    column = column_keys[field]
-                    if (
-                        (not field_chain and value is None)
-                        and column.default is None
-                        and not column.nullable
-                        and column.autoincrement is not True
-                    ):
-                        raise HTTPException(
-                            HTTP_400_BAD_REQUEST,
-                            'Table `{name}` requires fields: '
-                            '{fields}.'.format(
-                                name=model.name
-                                if isinstance(model, Table)
-                                else model.__tablename__,
-                                fields=', '.join(
-                                    f'`{column.key}`'
-                                    for column in column_keys.values()
-                                    if column.default is None
-                                    and not column.nullable
-                                    and column.autoincrement is not True
-                                ),
-                            ),
-                        )
+    ) -> Optional[list[dict[str, Any]]]:
+        validator = ModelValidator.get(model)
+        rows: list[dict[str, Any]] = []
+        for index, item in enumerate(
+            [body] if isinstance(body, dict) else body
+        ):
+            if not isinstance(item, dict):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f'Root element #{index} should be a dictionary.',
+                )
+            elif (row := validator.get_row(item)) is None:
+                return None
+            rows.append(row)
+        return rows
 
-                    ctype = None
-                    with suppress(NotImplementedError):
-                        ctype = column.type.python_type
-                    if ctype is None or isinstance(value, (ctype, type(None))):
-                        pass
-                    elif ctype == date:
-                        item[field] = isoparse(value).date()
-                    elif ctype == time:
-                        item[field] = isoparse(value).time()
-                    elif ctype == datetime:
-                        item[field] = isoparse(value)
-                    elif ctype == timedelta:
-                        if isinstance(value, (int, float)):
-                            item[field] = timedelta(seconds=value)
-                    continue
+    async def _insert_rows(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        rows: list[dict[str, Any]],
+        /,
+    ) -> None:
+        table = model if isinstance(model, Table) else model.__table__
+        groups: dict[FrozenSet[str], list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+        for keys, group in groups.items():
+            if len(group) >= self.copy_threshold:
+                await self._copy_rows(table, keys, group)
+            else:
+                await self.Session.execute(insert(table), group)
 
-                elif relationship_keys is None:
-                    raise HTTPException(
-                        HTTP_500_INTERNAL_SERVER_ERROR,
-                        f"Mapper for table '{model.name}' is not present.",
-                    )
-                elif relationship := relationship_keys.get(field):
-                    if not value:
-                        del item[field]
-                        continue
-                    try:
-                        item[field] = self.modify_item(
-                            relationship.entity.class_,
-                            value,
-                            (*field_chain, field),
-                        )
-                    except AttributeError as _:
-                        raise HTTPException(
-                            HTTP_500_INTERNAL_SERVER_ERROR,
-                            'Could not infer type for relationship: '
-                            f'{relationship}',
-                        ) from _
-            return model(**item)
+    async def _upsert_rows(
+        self: Self,
+        model: Union[Type[BaseInterface], Table],
+        rows: list[dict[str, Any]],
+        /,
+    ) -> None:
+        table = model if isinstance(model, Table) else model.__table__
+        groups: dict[FrozenSet[str], list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+        for group in groups.values():
+            statement = pg_insert(table)
+            if updates := {
+                column: statement.excluded[column.key]
+                for column in table.columns
+                if not column.primary_key
+                and not column.info.get('sums')
+                and (
+                    column.key not in {'created_at', 'updated_at'}
+                    or column.onupdate is not None
+                )
+            }:
+                statement = statement.on_conflict_do_update(
+                    index_elements=table.primary_key.columns, set_=updates
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(
+                    index_elements=table.primary_key.columns
+                )
+            await self.Session.execute(statement, group)
 
-        elif item:
-            items = []
-            for index, item in enumerate(item):
-                if not isinstance(item, dict):
-                    raise HTTPException(
-                        HTTP_400_BAD_REQUEST,
-                        f'%s element #{index} should be a dictionary.'
-                        % ('.'.join(field_chain) or 'Root'),
-                    )
-                items.append(self.modify_item(model, item, field_chain))
-            return items
+    async def _copy_rows(
+        self: Self,
+        table: Table,
+        keys: FrozenSet[str],
+        rows: list[dict[str, Any]],
+        /,
+    ) -> None:
+        connection = await self.Session.connection()
+        columns = [
+            column
+            for column in table.columns
+            if column.key in keys
+            or column.default is not None
+            and (column.default.is_scalar or column.default.is_callable)
+        ]
+        processors = [
+            column.type.dialect_impl(connection.dialect).bind_processor(
+                connection.dialect
+            )
+            for column in columns
+        ]
+
+        records: list[tuple[Any, ...]] = []
+        for row in rows:
+            record = []
+            for column, processor in zip(columns, processors):
+                if column.key in row:
+                    value = row[column.key]
+                elif column.default.is_callable:
+                    value = column.default.arg(None)
+                else:
+                    value = column.default.arg
+                record.append(value if processor is None else processor(value))
+            records.append(tuple(record))
+
+        # The driver transaction is started lazily by the first statement.
+        await connection.exec_driver_sql('SELECT 1')
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.connection.driver_connection
+        await driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=[column.name for column in columns],
+            schema_name=table.schema,
+        )
 
 
 @dataclass(init=False, frozen=True)
@@ -349,6 +1254,9 @@ class EndPointStatementBuilder(object):
     ]
     SerializedValue = Union[str, int, float]
     ColumnFilter = Tuple[SerializedValue, Union[str, operator]]
+    Entity = Tuple[
+        Tuple[str, Optional[str]], Tuple[Optional[str], Optional[operator]]
+    ]
 
     OperatorDict: Final[
         MappingProxyType[str, Optional[operator]]
@@ -357,6 +1265,29 @@ class EndPointStatementBuilder(object):
         | {'>=': ge, '<=': le, '!=': ne, '=': eq, '>': gt, '<': lt}
     )
 
+    Reserved: Final[FrozenSet[str]] = frozenset(
+        {'select', 'group_by', 'having', 'locale'}
+    )
+    CountModes: Final[FrozenSet[str]] = frozenset(
+        {'exact', 'estimate', 'exists'}
+    )
+    Aggregates: Final[
+        MappingProxyType[str, Callable[..., ColumnElement]]
+    ] = MappingProxyType(
+        {
+            'sum': func.sum,
+            'avg': func.avg,
+            'min': func.min,
+            'max': func.max,
+            'count': func.count,
+        }
+    )
+    Buckets: Final[FrozenSet[str]] = frozenset(
+        {'minute', 'hour', 'day', 'week', 'month', 'year'}
+    )
+
+    _plans: ClassVar[PlanCache] = PlanCache()
+
     @classmethod
     def select(
         cls: Type[Self],
@@ -366,11 +1297,31 @@ class EndPointStatementBuilder(object):
         *,
         limit: int = 0,
         offset: int = 0,
-        count: bool = False,
-    ) -> Tuple[ColumnClause, bool]:
-        registry, filters = cls._process(model, query)
+        count: str = '',
+        cursor: Optional[Sequence[Optional[str]]] = None,
+        validate: bool = False,
+    ) -> Tuple[StatementPlan, Dict[str, Any]]:
+        groups = cls._split(query)
+        key = (
+            'select',
+            model,
+            cls._get_shape(groups),
+            limit,
+            offset,
+            count,
+            None if cursor is None else bool(cursor),
+            validate,
+        )
+        if (plan := cls._plans.get(key)) is not None:
+            return plan, cls._get_params(plan, groups) | (
+                cls._get_cursor_params(plan, cursor)
+            )
+
+        registry, filters, bindings, params, reserved = cls._process(
+            model, groups
+        )
         fields: list[InstrumentedAttribute] = []
-        join_options: set[RelationshipProperty] = set()
+        join_options: dict[RelationshipProperty, None] = {}
         load_options: list[selectinload] = []
         orderings: list[ColumnClause] = []
         if not count:
@@ -383,8 +1334,7 @@ class EndPointStatementBuilder(object):
             for (chain, field), (value, op) in group_filters:
                 if isinstance(field, Column):
                     for link in chain:
-                        if link not in join_options:
-                            join_options.add(link)
+                        join_options.setdefault(link)
                 if isinstance(op, str):
                     if op == '@@':
                         clause = field.op(op)(func.to_tsquery(value))
@@ -407,40 +1357,535 @@ class EndPointStatementBuilder(object):
                 if not isinstance(field, Column):
                     if raw_select:
                         for link in field:
-                            if link not in join_options:
-                                join_options.add(link)
+                            join_options.setdefault(link)
                     else:
                         option = selectinload(next(chain := iter(field)))
                         for link in chain:
                             option = option.selectinload(link)
                         load_options.append(option)
 
-        if raw_select:
+        outer_join_options: dict[RelationshipProperty, None] = {}
+        locales: list[Tuple[FromClause, ColumnElement]] = []
+        if 'locale' in reserved and (fields or 'select' in reserved):
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                'Locale can not be combined with a projection.',
+            )
+        elif 'select' in reserved:
+            if fields:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    'Projection can not be combined with bare fields.',
+                )
+            result = []
+            for name in reserved['select'].split(','):
+                chain, field, _ = cls._get_expression(model, name.strip())
+                for link in chain:
+                    if link not in join_options:
+                        outer_join_options.setdefault(link)
+                result.append(field.label(name.strip()))
+        elif raw_select:
             result = [
                 _ if isinstance(_, Column) else _[-1].property.entity.class_
                 for _ in fields
             ]
-        elif count and not limit and not offset:
+        elif count == 'exact' and not limit and not offset:
             result = sa_count()
+        elif 'locale' in reserved and not count:
+            result, locales = cls._get_locale(model, reserved['locale'])
         else:
             result = model
 
+        groupings: list[ColumnElement] = []
+        havings: list[ColumnElement] = []
+        if 'group_by' in reserved or 'having' in reserved:
+            if 'select' not in reserved:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    'Grouping requires a projection with `select`.',
+                )
+            for name in filter(None, reserved.get('group_by', '').split(',')):
+                chain, field, aggregated = cls._get_expression(
+                    model, name.strip()
+                )
+                if aggregated:
+                    raise HTTPException(
+                        HTTP_400_BAD_REQUEST,
+                        f"Grouping '{name}' can not be an aggregate.",
+                    )
+                for link in chain:
+                    if link not in join_options:
+                        outer_join_options.setdefault(link)
+                groupings.append(field)
+            for condition in filter(
+                None, reserved.get('having', '').split(',')
+            ):
+                chain, clause = cls._get_having(model, condition.strip())
+                for link in chain:
+                    if link not in join_options:
+                        outer_join_options.setdefault(link)
+                havings.append(clause)
+
+        keys: list[Tuple[Column, bool, str]] = []
+        if cursor is not None:
+            if (
+                raw_select
+                or reserved.keys() & {'select', 'locale'}
+                or isinstance(model, Table)
+            ):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    'Cursor pagination is supported only for mapped models.',
+                )
+            keys.extend(cls._get_keyset(model, orderings))
+            orderings = [
+                column.desc() if descending else column.asc()
+                for column, descending, _ in keys
+            ]
+            if cursor:
+                or_clauses = [
+                    and_(or_(*or_clauses), cls._get_seek_clause(keys))
+                    if or_clauses
+                    else cls._get_seek_clause(keys)
+                ]
+
         statement = select(result)
+        if result is not model:
+            statement = statement.select_from(model)
         for link in join_options:
             statement = statement.join(link)
+        for link in outer_join_options:
+            statement = statement.outerjoin(link)
+        for table, onclause in locales:
+            statement = statement.outerjoin(table, onclause)
         if or_clauses:
             statement = statement.where(or_(*or_clauses))
+        if validate and (groupings or havings):
+            # The validator of the groups is the one of their rows.
+            return (
+                cls._plans.set(
+                    key,
+                    StatementPlan(
+                        cls._get_validator(statement), True, bindings
+                    ),
+                ),
+                params,
+            )
+        if groupings:
+            statement = statement.group_by(*groupings)
+        if havings:
+            statement = statement.having(and_(*havings))
         if orderings:
             statement = statement.order_by(*orderings)
-        if load_options:
+        if load_options and not validate:
             statement = statement.options(*load_options)
         if limit:
             statement = statement.limit(limit)
         if offset:
             statement = statement.offset(offset)
-        if count and (raw_select or limit or offset):
+        tables = None
+        if count == 'exists':
+            statement = select(exists(statement))
+        elif count == 'estimate':
+            statement = Explain(statement)
+        elif (
+            count
+            and isclass(model)
+            and issubclass(model, Counted)
+            and not (groups or limit or offset)
+        ):
+            # The rows are counted by the triggers of the table.
+            tables = frozenset({model.__table__})
+            statement = select(RowCountModel.total).where(
+                RowCountModel.table_name == model.__tablename__
+            )
+        elif count and (raw_select or 'select' in reserved or limit or offset):
             statement = select(sa_count()).select_from(statement)
-        return statement, raw_select or isinstance(model, Table)
+        elif validate:
+            statement = cls._get_validator(
+                statement,
+                model,
+                ()
+                if raw_select
+                else [_ for _ in fields if not isinstance(_, Column)],
+            )
+        plan = StatementPlan(
+            statement,
+            validate or raw_select or isinstance(model, Table),
+            bindings,
+            tuple(keys),
+            named='select' in reserved or bool(locales),
+            tables=tables,
+            loads=frozenset(
+                table
+                for field in fields
+                if not isinstance(field, Column)
+                for link in field
+                for table in (
+                    link.property.mapper.local_table,
+                    link.property.secondary,
+                )
+                if isinstance(table, Table)
+            )
+            if load_options
+            else frozenset(),
+        )
+        plan = cls._plans.set(key, plan)
+        return plan, params | cls._get_cursor_params(plan, cursor)
+
+    @classmethod
+    def _get_locale(
+        cls: Type[Self],
+        model: Union[Type[BaseInterface], Table],
+        locale: str,
+        /,
+    ) -> Tuple[List[ColumnElement], List[Tuple[FromClause, ColumnElement]]]:
+        """Return the fields of the `model` resolved in the `locale`.
+
+        Each of the localized fields is the one of the `locale`, of the
+        fallback locale of the settings or the `fallback_*` column, the first
+        of them present. The `fallback` of a single localized field resolves
+        into that field. The `*` locale resolves only the fallbacks.
+        """
+        mapper = getattr(model, '__mapper__', None)
+        if (
+            relationship := getattr(mapper, 'relationships', {}).get('locales')
+        ) is None:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Route is not localized.'
+            )
+        table, pairs = (
+            relationship.mapper.local_table,
+            relationship.local_remote_pairs,
+        )
+        settings = SettingsModel.__table__
+
+        codes: list[Tuple[FromClause, Tuple[ColumnElement, ...]]] = []
+        if locale != '*':
+            language, _, country = locale.replace('_', '-').partition('-')
+            if not (
+                len(language) == len(country) == 2
+                and (language + country).isalpha()
+            ):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST, f"Locale '{locale}' is invalid."
+                )
+            codes.append(
+                (
+                    table,
+                    (
+                        literal(language, table.c.locale_language_code.type),
+                        literal(country, table.c.locale_country_code.type),
+                    ),
+                )
+            )
+        codes.append(
+            (
+                table.alias(),
+                (
+                    settings.c.fallback_locale_language_code,
+                    settings.c.fallback_locale_country_code,
+                ),
+            )
+        )
+
+        locales: list[Tuple[FromClause, ColumnElement]] = []
+        for alias, (language, country) in codes:
+            if alias is not table:
+                # The settings are a single row by the check of its key.
+                locales.append((settings, settings.c.id))
+            locales.append(
+                (
+                    alias,
+                    and_(
+                        *(
+                            alias.c[remote.name] == local
+                            for local, remote in pairs
+                        ),
+                        alias.c.locale_language_code == language,
+                        alias.c.locale_country_code == country,
+                    ),
+                )
+            )
+        # The texts have the single `fallback` for the `value` of the locales.
+        values = [
+            _.name
+            for _ in table.c
+            if not (_.primary_key or _.foreign_keys)
+            and _.name not in {'created_at', 'updated_at'}
+        ]
+        fields: List[ColumnElement] = []
+        for column in model.__table__.c:
+            name = column.name.removeprefix('fallback_')
+            if column.name == 'fallback' and len(values) == 1:
+                name = values[0]
+            if name != column.name and name in table.c:
+                fields.append(
+                    func.coalesce(
+                        *(alias.c[name] for alias, _ in codes), column
+                    ).label(name)
+                )
+            else:
+                fields.append(column)
+        return fields, locales
+
+    @classmethod
+    def _get_expression(
+        cls: Type[Self],
+        model: Union[Type[BaseInterface], Table],
+        name: str,
+        /,
+    ) -> Tuple[List[RelationshipProperty], ColumnElement, bool]:
+        function, parenthesis, argument = name.partition('(')
+        if not parenthesis:
+            *chain, field = cls._get_field(model, name)
+            field_property = getattr(field, 'property', field)
+            field = getattr(field_property, 'expression', field)
+            if not isinstance(field, Column):
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    f"Projected field '{name}' should be a column.",
+                )
+            return chain, field, False
+        elif not argument.endswith(')'):
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, f"Expression '{name}' is invalid."
+            )
+
+        function, argument = function.strip().lower(), argument[:-1].strip()
+        if function == 'count' and argument in {'', '*'}:
+            return [], sa_count(), True
+        chain, field, aggregated = cls._get_expression(model, argument)
+        if aggregated:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                f"Expression '{name}' can not nest the aggregates.",
+            )
+        elif function in cls.Aggregates:
+            return chain, cls.Aggregates[function](field), True
+        elif function in cls.Buckets:
+            # The unit is inlined, so the grouped buckets match the selected.
+            return (
+                chain,
+                func.date_trunc(literal_column(f"'{function}'"), field),
+                False,
+            )
+        raise HTTPException(
+            HTTP_400_BAD_REQUEST,
+            f"Function '{function}' is not supported. Available functions: "
+            + ', '.join(
+                f"'{_}'" for _ in (*cls.Aggregates, *sorted(cls.Buckets))
+            )
+            + '.',
+        )
+
+    @classmethod
+    def _get_having(
+        cls: Type[Self],
+        model: Union[Type[BaseInterface], Table],
+        condition: str,
+        /,
+    ) -> Tuple[List[RelationshipProperty], ColumnElement]:
+        for op_key, op in cls.OperatorDict.items():
+            name, separator, value = condition.partition(op_key)
+            if separator and op is not None:
+                break
+        else:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, f"Condition '{condition}' is invalid."
+            )
+
+        chain, field, _ = cls._get_expression(model, name.strip())
+        python_type = None
+        with suppress(NotImplementedError):
+            python_type = field.type.python_type
+        try:
+            if python_type in {int, float, Decimal}:
+                value = python_type(value)
+            elif python_type in {date, datetime}:
+                value = isoparse(value)
+        except (ValueError, ArithmeticError) as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                f"Value '{value}' of condition '{condition}' is invalid.",
+            ) from _
+        return chain, op(field, value)
+
+    @staticmethod
+    def _get_validator(
+        statement: Select,
+        model: Union[Type[BaseInterface], Table, None] = None,
+        loads: Sequence[Sequence[InstrumentedAttribute]] = (),
+        /,
+    ) -> Select:
+        # The timestamps are taken from the FROM elements themselves, so the
+        # aliases are validated by their own rows and not cross joined.
+        froms, elements = list(statement.get_final_froms()), []
+        while froms:
+            if isinstance(element := froms.pop(0), Join):
+                froms[:0] = element.left, element.right
+            elif 'updated_at' in element.c:
+                elements.append(element)
+        timestamps = [
+            element.c.updated_at.label(f'u{index}')
+            for index, element in enumerate(dict.fromkeys(elements))
+        ]
+        if not timestamps:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Query is not timestamped.'
+            )
+        subquery = statement.with_only_columns(*timestamps).subquery()
+        updates = [func.max(subquery.c[_.name]) for _ in timestamps]
+        counts: list[ColumnElement] = [sa_count()]
+
+        # The relationships loaded for the rows are validated by the rows
+        # they load, joined to the rows of the statement.
+        if loads and model is not None:
+            rows = aliased(
+                model,
+                statement.with_only_columns(*model.__table__.c).subquery(),
+            )
+            for chain in loads:
+                related = select().select_from(rows)
+                tables: list[Table] = []
+                for index, link in enumerate(chain):
+                    related = related.join(
+                        getattr(rows, link.key) if not index else link
+                    )
+                    table = link.property.mapper.local_table
+                    if 'updated_at' in table.c:
+                        tables.append(table)
+                if tables:
+                    updates.append(
+                        related.with_only_columns(
+                            func.greatest(
+                                *(func.max(_.c.updated_at) for _ in tables)
+                            )
+                        ).scalar_subquery()
+                    )
+                counts.append(
+                    related.with_only_columns(sa_count()).scalar_subquery()
+                )
+        return select(
+            func.greatest(*updates), sum(counts[1:], counts[0])
+        ).select_from(subquery)
+
+    @classmethod
+    def encode_cursor(
+        cls: Type[Self], plan: StatementPlan, item: Any, /
+    ) -> str:
+        values = []
+        for _, _, attribute in plan.keys:
+            if isinstance(value := getattr(item, attribute), bool):
+                value = str(value).lower()
+            elif isinstance(value, timedelta):
+                value = str(value.total_seconds())
+            elif isinstance(value, (date, time, datetime)):
+                value = value.isoformat()
+            values.append(quote(str(value), safe=''))
+        return urlsafe_b64encode(dumps(values)).decode().rstrip('=')
+
+    @classmethod
+    def decode_cursor(cls: Type[Self], token: str, /) -> list[str]:
+        try:
+            values = loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            if not isinstance(values, list) or not all(
+                isinstance(value, str) for value in values
+            ):
+                raise ValueError
+        except ValueError as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Cursor is invalid.'
+            ) from _
+        return values
+
+    @classmethod
+    def _get_keyset(
+        cls: Type[Self],
+        model: Type[BaseInterface],
+        orderings: Iterable[ColumnClause],
+        /,
+    ) -> list[Tuple[Column, bool, str]]:
+        mapper, keys = model.__mapper__, []
+        for ordering in orderings:
+            column = ordering.element
+            if column.table is not mapper.local_table:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    'Cursor pagination supports ordering only by the fields '
+                    f"of the '{mapper.local_table.name}' table.",
+                )
+            elif column.nullable:
+                raise HTTPException(
+                    HTTP_400_BAD_REQUEST,
+                    'Cursor pagination does not support ordering by nullable '
+                    f"field '{column.key}'.",
+                )
+            keys.append(
+                (
+                    column,
+                    ordering.modifier is desc_op,
+                    mapper.get_property_by_column(column).key,
+                )
+            )
+        for column in mapper.local_table.primary_key.columns:
+            if all(column is not key for key, _, _ in keys):
+                keys.append(
+                    (column, False, mapper.get_property_by_column(column).key)
+                )
+        return keys
+
+    @staticmethod
+    def _get_seek_clause(
+        keys: Sequence[Tuple[Column, bool, str]],
+        /,
+    ) -> ColumnClause:
+        params = [
+            bindparam(f'c{index}', type_=column.type)
+            for index, (column, _, _) in enumerate(keys)
+        ]
+        if len(directions := {descending for _, descending, _ in keys}) == 1:
+            columns = tuple_(*(column for column, _, _ in keys))
+            return (
+                columns < tuple_(*params)
+                if directions.pop()
+                else columns > tuple_(*params)
+            )
+
+        or_clauses: list[ColumnClause] = []
+        for index, (column, descending, _) in enumerate(keys):
+            or_clauses.append(
+                and_(
+                    *(keys[_][0] == params[_] for _ in range(index)),
+                    column < params[index]
+                    if descending
+                    else column > params[index],
+                )
+            )
+        return or_(*or_clauses)
+
+    @classmethod
+    def _get_cursor_params(
+        cls: Type[Self],
+        plan: StatementPlan,
+        cursor: Optional[Sequence[Optional[str]]],
+        /,
+    ) -> Dict[str, Any]:
+        if not cursor:
+            return {}
+        elif len(cursor) != len(plan.keys):
+            raise HTTPException(HTTP_400_BAD_REQUEST, 'Cursor is invalid.')
+
+        params: Dict[str, Any] = {}
+        for index, ((column, _, _), value) in enumerate(
+            zip(plan.keys, cursor)
+        ):
+            if (
+                value := cls._get_filter_value(column, 'cursor', value)
+            ) is None:
+                raise HTTPException(HTTP_400_BAD_REQUEST, 'Cursor is invalid.')
+            params[f'c{index}'] = value
+        return params
 
     @classmethod
     def delete(
@@ -448,8 +1893,13 @@ class EndPointStatementBuilder(object):
         model: Union[Type[BaseInterface], Table],
         /,
         query: str,
-    ) -> ColumnClause:
-        registry, filters = cls._process(model, query)
+    ) -> Tuple[StatementPlan, Dict[str, Any]]:
+        groups = cls._split(query)
+        key = ('delete', model, cls._get_shape(groups))
+        if (plan := cls._plans.get(key)) is not None:
+            return plan, cls._get_params(plan, groups)
+
+        registry, filters, bindings, params, _ = cls._process(model, groups)
         or_clauses: list[ColumnClause] = []
         for group_filters in filters:
             and_clauses: list[ColumnClause] = []
@@ -470,50 +1920,144 @@ class EndPointStatementBuilder(object):
         statement = delete(model)
         if or_clauses:
             statement = statement.where(or_(*or_clauses))
-        return statement
+        return cls._plans.set(
+            key, StatementPlan(statement, False, bindings)
+        ), (params)
+
+    @classmethod
+    def _split(
+        cls: Type[Self],
+        query: str,
+        /,
+    ) -> List[List[Entity]]:
+        groups = []
+        for entity_group in unquote(query.replace('+', ' ')).split('|'):
+            if group := [
+                cls._process_query(entity)
+                for entity in entity_group.split('&')
+                if entity
+            ]:
+                groups.append(group)
+        return groups
+
+    @staticmethod
+    def normalize(query: str, /) -> str:
+        return '|'.join(
+            '&'.join(_ for _ in entity_group.split('&') if _)
+            for entity_group in unquote(query.replace('+', ' ')).split('|')
+        )
+
+    @staticmethod
+    def _get_shape(groups: List[List[Entity]], /) -> Hashable:
+        return tuple(
+            tuple(
+                (
+                    name,
+                    op_key,
+                    value
+                    if name in EndPointStatementBuilder.Reserved
+                    else bool(value),
+                )
+                for (name, value), (op_key, _) in group
+            )
+            for group in groups
+        )
+
+    @classmethod
+    def _get_params(
+        cls: Type[Self],
+        plan: StatementPlan,
+        groups: List[List[Entity]],
+        /,
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        entities = (entity for group in groups for entity in group)
+        for binding, ((name, value), _) in zip(plan.bindings, entities):
+            if binding is not None:
+                param, column = binding
+                params[param] = (
+                    value
+                    if column is None
+                    else cls._get_filter_value(column, name, value)
+                )
+        return params
 
     @classmethod
     def _process(
         cls: Type[Self],
         model: Union[Type[BaseInterface], Table],
-        query: str,
+        groups: List[List[Entity]],
         /,
     ) -> Tuple[
-        Dict[Key, Iterable[ColumnClause]], List[List[Tuple[Key, ColumnFilter]]]
+        Dict[Key, Iterable[ColumnClause]],
+        List[List[Tuple[Key, ColumnFilter]]],
+        Tuple[Optional[Tuple[str, Optional[Column]]], ...],
+        Dict[str, Any],
+        Dict[str, str],
     ]:
-        registry, filters = {}, []
-        for entity_group in unquote(query.replace('+', ' ')).split('|'):
+        registry, filters, bindings, params, reserved = {}, [], [], {}, {}
+        for entity_group in groups:
             group_filters: List = []
-            for entity in entity_group.split('&'):
-                (name, value), (op_key, op) = cls._process_query(entity)
+            for (name, value), (op_key, op) in entity_group:
+                # The bare `locale` is the relationship of the locale models.
+                if name in cls.Reserved and (name != 'locale' or op_key):
+                    if op_key != '=' or name in reserved:
+                        raise HTTPException(
+                            HTTP_400_BAD_REQUEST,
+                            f"Parameter '{name}' should be set once with "
+                            "the '=' operator.",
+                        )
+                    bindings.append(None)
+                    reserved[name] = value
+                    continue
+
                 *chain, field = cls._get_field(model, name)
                 field_property = getattr(field, 'property', field)
                 field = getattr(field_property, 'expression', field)
                 if (key := (tuple(chain), field)) not in registry:
                     registry[key] = []
-                if not isinstance(field, Column):
-                    group_filters.append((key, (value, op or op_key)))
-                    continue
-
-                if name.endswith('..'):
-                    registry[key].append(field.desc())
-                elif name.endswith('.'):
-                    registry[key].append(field.asc())
+                if isinstance(field, Column):
+                    if name.endswith('..'):
+                        registry[key].append(field.desc())
+                    elif name.endswith('.'):
+                        registry[key].append(field.asc())
+                    value = cls._get_filter_value(field, name, value)
 
-                try:
-                    value = cls._get_column_value(field, value)
-                    group_filters.append((key, (value, op or op_key)))
-                except ValueError as e:
-                    column_type = cls._get_column_type(field)
-                    raise HTTPException(
-                        HTTP_400_BAD_REQUEST,
-                        f"Value of type '{type(value).__name__}' of "
-                        f"parameter '{name}' is invalid, should be valid "
-                        f"value of type '{column_type.__name__}'.",
-                    ) from e
+                if (op or op_key) is None or value is None:
+                    bindings.append(None)
+                    if isinstance(field, Column) and name.endswith('.'):
+                        continue
+                else:
+                    column = field if isinstance(field, Column) else None
+                    param = f'p{len(bindings)}'
+                    bindings.append((param, column))
+                    params[param] = value
+                    value = bindparam(
+                        param, type_=getattr(column, 'type', None)
+                    )
+                group_filters.append((key, (value, op or op_key)))
             if group_filters:
                 filters.append(group_filters)
-        return registry, filters
+        return registry, filters, tuple(bindings), params, reserved
+
+    @classmethod
+    def _get_filter_value(
+        cls: Type[Self],
+        column: Column,
+        name: str,
+        value: Optional[str],
+        /,
+    ) -> Optional[Any]:
+        try:
+            return cls._get_column_value(column, value)
+        except ValueError as e:
+            column_type = cls._get_column_type(column)
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST,
+                f"Value of type '{type(value).__name__}' of "
+                f"parameter '{name}' is invalid, should be valid "
+                f"value of type '{column_type.__name__}'.",
+            ) from e
 
     @classmethod
     def _process_query(
@@ -523,6 +2067,10 @@ class EndPointStatementBuilder(object):
     ) -> Tuple[
         Tuple[str, Optional[str]], Tuple[Optional[str], Optional[operator]]
     ]:
+        # The reserved values are expressions containing the operators.
+        name, separator, value = entity.partition('=')
+        if separator and name in cls.Reserved:
+            return (name, value), ('=', eq)
         for op_key, op in cls.OperatorDict.items():
             name, separator, value = entity.partition(op_key)
             if separator:
@@ -564,12 +2112,12 @@ class EndPointStatementBuilder(object):
             value = column_type(value)
         elif issubclass(column_type, timedelta):
             value = timedelta(seconds=float(value))
+        elif issubclass(column_type, datetime):
+            value = isoparse(value)
         elif issubclass(column_type, date):
             value = isoparse(value).date()
         elif issubclass(column_type, time):
             value = isoparse(value).time()
-        elif issubclass(column_type, datetime):
-            value = isoparse(value)
         return value
 
     @classmethod
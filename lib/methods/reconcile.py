@@ -0,0 +1,32 @@
+from fastapi.exceptions import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from sqlalchemy.sql.schema import MetaData
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+
+from ..callbacks.reconcile_sums import reconcile_sums
+from .endpoint import EndPoint
+
+
+async def reconcile(request: Request, /) -> Response:
+    if not isinstance(engine := request.scope.get('engine'), AsyncEngine):
+        raise HTTPException(
+            HTTP_500_INTERNAL_SERVER_ERROR, 'Engine is not present.'
+        )
+    elif not isinstance(metadata := request.scope.get('metadata'), MetaData):
+        raise HTTPException(
+            HTTP_500_INTERNAL_SERVER_ERROR, 'MetaData is not present.'
+        )
+
+    corrected = await reconcile_sums(metadata, bind=engine)
+    if tables := frozenset(
+        metadata.tables[name.rpartition('.')[0]]
+        for name, rows in corrected.items()
+        if rows
+    ):
+        EndPoint.response_cache.invalidate(tables)
+        for listener in EndPoint.write_listeners:
+            listener(tables)
+    return ORJSONResponse(corrected)
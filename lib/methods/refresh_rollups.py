@@ -0,0 +1,22 @@
+from fastapi.exceptions import HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+
+from ..utils.rollup_refresher import RollupRefresher
+
+
+async def refresh_rollups(request: Request, /) -> Response:
+    if not isinstance(
+        refresher := request.scope.get('rollup_refresher'), RollupRefresher
+    ):
+        raise HTTPException(
+            HTTP_500_INTERNAL_SERVER_ERROR, 'Rollup refresher is not present.'
+        )
+    return ORJSONResponse(
+        await refresher.refresh(
+            rebuild=request.query_params.get('rebuild', '').lower()
+            in {'1', 'true'}
+        )
+    )
@@ -0,0 +1,47 @@
+from fastapi.exceptions import HTTPException
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import (
+    HTTP_304_NOT_MODIFIED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+
+from ._translation_store import TranslationStore
+
+
+async def translations(request: Request, /) -> Response:
+    if not isinstance(
+        store := request.scope.get('translation_store'), TranslationStore
+    ):
+        raise HTTPException(
+            HTTP_500_INTERNAL_SERVER_ERROR, 'Translation store is not present.'
+        )
+    elif not isinstance(engine := request.scope.get('engine'), AsyncEngine):
+        raise HTTPException(
+            HTTP_500_INTERNAL_SERVER_ERROR, 'Engine is not present.'
+        )
+
+    await store.load(engine)
+    if (
+        locale := store.parse_locale(request.path_params['locale'])
+    ) is None or (bundle := store.get_bundle(locale)) is None:
+        raise HTTPException(HTTP_400_BAD_REQUEST, 'Locale is not determined.')
+
+    headers = {'ETag': bundle.etag, 'Vary': 'Accept-Encoding'}
+    if if_none_match := request.headers.get('If-None-Match'):
+        if any(
+            _.strip().removeprefix('W/') in {bundle.etag, '*'}
+            for _ in if_none_match.split(',')
+        ):
+            return Response(None, HTTP_304_NOT_MODIFIED, headers)
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        return Response(
+            bundle.compressed,
+            headers=headers | {'Content-Encoding': 'gzip'},
+            media_type='application/json',
+        )
+    return Response(
+        bundle.body, headers=headers, media_type='application/json'
+    )
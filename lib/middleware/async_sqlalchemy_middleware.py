@@ -12,7 +12,7 @@ from sqlalchemy.orm.session import Session as SyncSession
 from sqlalchemy.orm.session import sessionmaker
 from sqlalchemy.sql.schema import MetaData
 from starlette.responses import Response
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from typing_extensions import Self
 
 from ..utils.anyfunction import anycorofunction
@@ -119,7 +119,7 @@ class AsyncSQLAlchemyMiddleware(object):
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType],
     ) -> None:
-        await self.stop(dispose=exc_val is not None)
+        await self.stop()
 
     async def __call__(
         self: Self,
@@ -128,9 +128,47 @@ class AsyncSQLAlchemyMiddleware(object):
         receive: Receive,
         send: Send,
     ) -> Response:
-        async with self:
-            scope['engine'] = self.engine
-            scope['Session'] = self.Session
-            scope['metadata'] = self.metadata
-            scope['Base'] = self.Base
+        scope['engine'] = self.engine
+        scope['Session'] = self.Session
+        scope['metadata'] = self.metadata
+        scope['Base'] = self.Base
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(scope, receive, send)
+
+        try:
             return await self.app(scope, receive, send)
+        finally:
+            await self.stop(dispose=False)
+
+    async def lifespan(
+        self: Self,
+        /,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        async def lifespan_receive() -> Message:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.start()
+                except BaseException as _:
+                    await send(
+                        dict(type='lifespan.startup.failed', message=repr(_))
+                    )
+                    raise
+            return message
+
+        async def lifespan_send(message: Message, /) -> None:
+            if message['type'] in {
+                'lifespan.shutdown.complete',
+                'lifespan.shutdown.failed',
+            }:
+                try:
+                    await self.stop()
+                finally:
+                    await send(message)
+            else:
+                await send(message)
+
+        return await self.app(scope, lifespan_receive, lifespan_send)
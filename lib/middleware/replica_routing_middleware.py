@@ -0,0 +1,192 @@
+from asyncio import current_task
+from dataclasses import dataclass
+from itertools import count
+from logging import Logger
+from time import monotonic
+from typing import Any, Dict, Final, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi.exceptions import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from sqlalchemy.ext.asyncio.scoping import async_scoped_session
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm.session import sessionmaker
+from sqlalchemy.sql.expression import text
+from starlette.responses import Response
+from starlette.status import HTTP_400_BAD_REQUEST
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing_extensions import Self
+
+
+@dataclass(init=False, frozen=True)
+class ReplicaRoutingMiddleware(object):
+
+    logger: Final[Logger]
+    app: Final[ASGIApp]
+    primary: Final[AsyncEngine]
+    replicas: Final[Tuple[Tuple[AsyncEngine, async_scoped_session], ...]]
+    lag_ttl: Final[float]
+    _lsn: Final[List[Tuple[int, float]]]
+    _next: Final[Iterator[int]]
+    _stats: Final[Dict[str, int]]
+
+    def __init__(
+        self: Self,
+        /,
+        app: ASGIApp,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine],
+        *,
+        lag_ttl: float = 0.05,
+    ) -> None:
+        object.__setattr__(self, 'logger', Logger(self.__class__.__name__))
+        object.__setattr__(self, 'app', app)
+        object.__setattr__(self, 'primary', primary)
+        object.__setattr__(
+            self,
+            'replicas',
+            tuple(
+                (
+                    engine,
+                    async_scoped_session(
+                        sessionmaker(
+                            engine,
+                            class_=AsyncSession,
+                            expire_on_commit=False,
+                            future=True,
+                        ),
+                        scopefunc=current_task,
+                    ),
+                )
+                for engine in replicas
+            ),
+        )
+        object.__setattr__(self, 'lag_ttl', lag_ttl)
+        object.__setattr__(self, '_lsn', [(0, 0.0) for _ in self.replicas])
+        object.__setattr__(self, '_next', count())
+        object.__setattr__(
+            self, '_stats', dict(replica=0, primary=0, refreshes=0)
+        )
+
+    @staticmethod
+    def parse_lsn(lsn: str, /) -> int:
+        high, _, low = lsn.partition('/')
+        try:
+            return (int(high, 16) << 32) + int(low, 16)
+        except ValueError as _:
+            raise HTTPException(
+                HTTP_400_BAD_REQUEST, 'Session token is invalid.'
+            ) from _
+
+    async def get_token(self: Self, /) -> str:
+        async with self.primary.connect() as connection:
+            return await connection.scalar(
+                text('SELECT pg_current_wal_lsn()::text')
+            )
+
+    async def get_session(
+        self: Self,
+        /,
+        token: Optional[str] = None,
+    ) -> Optional[async_scoped_session]:
+        if not self.replicas:
+            return None
+
+        start = next(self._next)
+        indexes = [
+            (start + _) % len(self.replicas) for _ in range(len(self.replicas))
+        ]
+        if not token:
+            self._stats['replica'] += 1
+            return self.replicas[indexes[0]][1]
+
+        lsn = self.parse_lsn(token)
+        for index in indexes:
+            if self._lsn[index][0] >= lsn:
+                self._stats['replica'] += 1
+                return self.replicas[index][1]
+        for index in indexes:
+            if monotonic() - self._lsn[index][1] < self.lag_ttl:
+                continue
+            elif await self._refresh(index) >= lsn:
+                self._stats['replica'] += 1
+                return self.replicas[index][1]
+        self._stats['primary'] += 1
+        return None
+
+    async def _refresh(self: Self, index: int, /) -> int:
+        self._stats['refreshes'] += 1
+        engine, _ = self.replicas[index]
+        try:
+            async with engine.connect() as connection:
+                lsn = await connection.scalar(
+                    text(
+                        'SELECT coalesce('
+                        'pg_last_wal_replay_lsn(), pg_current_wal_lsn()'
+                        ')::text'
+                    )
+                )
+        except SQLAlchemyError as _:
+            self.logger.warning(f'Replica #{index} is unavailable: {_!r}')
+            lsn = None
+        self._lsn[index] = (
+            0 if lsn is None else self.parse_lsn(lsn),
+            monotonic(),
+        )
+        return self._lsn[index][0]
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(
+            replicas=[
+                getattr(engine.sync_engine.pool, 'stats', None)
+                for engine, _ in self.replicas
+            ]
+        )
+
+    async def stop(self: Self, /, *, dispose: bool = True) -> None:
+        try:
+            for _, Session in self.replicas:
+                await Session.remove()
+        finally:
+            if dispose:
+                self.logger.info('Replica engines disposal.')
+                for engine, _ in self.replicas:
+                    await engine.dispose()
+
+    async def __call__(
+        self: Self,
+        /,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> Response:
+        scope['replicas'] = self
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(scope, receive, send)
+
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            await self.stop(dispose=False)
+
+    async def lifespan(
+        self: Self,
+        /,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        async def lifespan_send(message: Message, /) -> None:
+            if message['type'] in {
+                'lifespan.shutdown.complete',
+                'lifespan.shutdown.failed',
+            }:
+                try:
+                    await self.stop()
+                finally:
+                    await send(message)
+            else:
+                await send(message)
+
+        return await self.app(scope, receive, lifespan_send)
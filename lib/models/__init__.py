@@ -1,6 +1,6 @@
 from typing import Final, Tuple
 
-from ._mixins import Timestamped
+from ._mixins import Counted, Rollup, Timestamped
 from .auth.audit_log_entry_model import AuditLogEntryModel
 from .auth.identity_model import IdentityModel
 from .auth.instance_model import InstanceModel
@@ -87,12 +87,20 @@ from .containers.tanks.operations.openings.container_tank_company_opening_drop_m
 from .containers.tanks.operations.openings.container_tank_company_opening_model import (
     ContainerTankCompanyOpeningModel,
 )
+from .containers.tanks.operations.openings.container_tank_company_opening_rollup_model import (
+    ContainerTankCompanyOpeningDailyRollupModel,
+    ContainerTankCompanyOpeningHourlyRollupModel,
+)
 from .containers.tanks.operations.openings.container_tank_person_opening_drop_model import (
     ContainerTankPersonOpeningDropModel,
 )
 from .containers.tanks.operations.openings.container_tank_person_opening_model import (
     ContainerTankPersonOpeningModel,
 )
+from .containers.tanks.operations.openings.container_tank_person_opening_rollup_model import (
+    ContainerTankPersonOpeningDailyRollupModel,
+    ContainerTankPersonOpeningHourlyRollupModel,
+)
 
 # from .deliveries.delivery_model import DeliveryModel
 # from .deliveries.delivery_nomenclature_model import DeliveryNomenclatureModel
@@ -108,6 +116,8 @@ from .misc.measurements.measurement_locale_model import MeasurementLocaleModel
 from .misc.measurements.measurement_model import MeasurementModel
 from .misc.prices.price_locale_model import PriceLocaleModel
 from .misc.prices.price_model import PriceModel
+from .misc.rollup_watermark_model import RollupWatermarkModel
+from .misc.row_count_model import RowCountModel
 from .misc.settings_model import SettingsModel
 from .nomenclatures.categories.nomenclature_category_locale_model import (
     NomenclatureCategoryLocaleModel,
@@ -131,6 +141,8 @@ from .people.person_locale_model import PersonLocaleModel
 from .people.person_model import PersonModel
 
 __all__: Final[Tuple[str, ...]] = (
+    'Counted',
+    'Rollup',
     'Timestamped',
     'AuditLogEntryModel',
     'IdentityModel',
@@ -175,8 +187,12 @@ __all__: Final[Tuple[str, ...]] = (
     # 'ContainerTankClearingModel',
     'ContainerTankCompanyOpeningDropModel',
     'ContainerTankCompanyOpeningModel',
+    'ContainerTankCompanyOpeningDailyRollupModel',
+    'ContainerTankCompanyOpeningHourlyRollupModel',
     'ContainerTankPersonOpeningDropModel',
     'ContainerTankPersonOpeningModel',
+    'ContainerTankPersonOpeningDailyRollupModel',
+    'ContainerTankPersonOpeningHourlyRollupModel',
     # 'DeliveryModel',
     # 'DeliveryNomenclatureModel',
     'AddressLocaleModel',
@@ -191,6 +207,8 @@ __all__: Final[Tuple[str, ...]] = (
     'MeasurementModel',
     'PriceLocaleModel',
     'PriceModel',
+    'RollupWatermarkModel',
+    'RowCountModel',
     'SettingsModel',
     'NomenclatureCategoryLocaleModel',
     'NomenclatureCategoryModel',
@@ -1,11 +1,20 @@
 """The module with the mixins for the mapped classes."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from typing import Any, ClassVar, Dict, Final, List, Tuple, Type
 
 from dateutil.tz.tz import tzlocal
+from sqlalchemy.engine.base import Connection
+from sqlalchemy.event.api import contains, listen, listens_for
 from sqlalchemy.orm.decl_api import declared_attr
-from sqlalchemy.sql.schema import Column
-from sqlalchemy.sql.sqltypes import DateTime
+from sqlalchemy.orm.mapper import Mapper
+from sqlalchemy.sql.ddl import DDL
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.expression import and_, select, text, update
+from sqlalchemy.sql.functions import func
+from sqlalchemy.sql.schema import Column, MetaData, Table
+from sqlalchemy.sql.sqltypes import BigInteger, DateTime
 from typing_extensions import Self
 
 
@@ -30,3 +39,301 @@ class Timestamped(object):
             default=lambda: datetime.now(tzlocal()),
             onupdate=lambda: datetime.now(tzlocal()),
         )
+
+
+class Rollup(object):
+    """The mixin for the rollups of the rows of the `rollup_source`.
+
+    The rows are counted by the buckets of `rollup_unit` of their creation
+    time and by the other columns of the primary key, matched to the columns
+    of the source by their names. The `rollup_sums` are summed into the
+    columns of the same names, from the source or from the rows referencing
+    it, bucketed by their own creation time.
+    """
+
+    Units: ClassVar[Dict[str, timedelta]] = dict(
+        hour=timedelta(hours=1),
+        day=timedelta(days=1),
+    )
+
+    rollup_unit: ClassVar[str]
+    rollup_source: ClassVar[Table]
+    rollup_sums: ClassVar[Tuple[Column, ...]] = ()
+
+    @declared_attr
+    def bucket(self: Self, /) -> Column[datetime]:
+        """Set the start of the bucket of the rows."""
+        return Column(DateTime(timezone=True), primary_key=True, index=True)
+
+    @declared_attr
+    def count(self: Self, /) -> Column[int]:
+        """Set the count of the rows in the bucket."""
+        return Column(BigInteger, nullable=False, default=0)
+
+
+class Counted(object):
+    """The mixin for maintaining the exact row count of the mapped classes.
+
+    The inserted, deleted and truncated rows are counted by the statement
+    level triggers into the `row_counts` table, so counting all the rows of
+    the table does not scan it. Every write to the table updates the same
+    row of the `row_counts`, so it fits the tables read more than written.
+    The count is seeded only once, when the table is counted the first time.
+    """
+
+
+_count_rows: Final[DDL] = DDL(
+    'CREATE OR REPLACE FUNCTION count_rows() RETURNS trigger '
+    'LANGUAGE plpgsql AS $$ BEGIN '
+    "IF TG_OP = 'INSERT' THEN "
+    'UPDATE row_counts SET total = total + (SELECT count(*) FROM new_rows) '
+    'WHERE table_name = TG_TABLE_NAME; '
+    "ELSIF TG_OP = 'DELETE' THEN "
+    'UPDATE row_counts SET total = total - (SELECT count(*) FROM old_rows) '
+    'WHERE table_name = TG_TABLE_NAME; '
+    'ELSE UPDATE row_counts SET total = 0 WHERE table_name = TG_TABLE_NAME; '
+    'END IF; RETURN NULL; END $$'
+).execute_if(dialect='postgresql')
+
+
+@listens_for(Counted, 'instrument_class', propagate=True)
+def _count_table_rows(mapper: Mapper, cls: Type[Counted], /) -> None:
+    metadata = mapper.local_table.metadata
+    mapper.local_table.info['counted'] = True
+    if not contains(metadata, 'after_create', _count_rows):
+        listen(metadata, 'after_create', _count_rows)
+    context = dict(name=mapper.local_table.name)
+    for statement in (
+        'DROP TRIGGER IF EXISTS %(name)s_count_insert ON %(name)s',
+        'CREATE TRIGGER %(name)s_count_insert AFTER INSERT ON %(name)s '
+        'REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION count_rows()',
+        'DROP TRIGGER IF EXISTS %(name)s_count_delete ON %(name)s',
+        'CREATE TRIGGER %(name)s_count_delete AFTER DELETE ON %(name)s '
+        'REFERENCING OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION count_rows()',
+        'DROP TRIGGER IF EXISTS %(name)s_count_truncate ON %(name)s',
+        'CREATE TRIGGER %(name)s_count_truncate AFTER TRUNCATE ON %(name)s '
+        'FOR EACH STATEMENT EXECUTE FUNCTION count_rows()',
+        "INSERT INTO row_counts VALUES ('%(name)s', "
+        '(SELECT count(*) FROM %(name)s)) ON CONFLICT (table_name) '
+        'DO NOTHING',
+    ):
+        listen(
+            metadata,
+            'after_create',
+            DDL(statement, context=context).execute_if(dialect='postgresql'),
+        )
+
+
+def uncount_tables(
+    metadata: MetaData, connection: Connection, /, **kw: Any
+) -> None:
+    """Drop the row counts of the tables that are no longer :class:`Counted`.
+
+    Their triggers would otherwise keep serializing the writes to them on
+    the same row of the `row_counts`.
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    tables = [
+        name
+        for (name,) in connection.execute(
+            text(
+                'SELECT DISTINCT c.relname FROM pg_trigger t '
+                'JOIN pg_class c ON c.oid = t.tgrelid '
+                "WHERE t.tgname = c.relname || '_count_insert'"
+            )
+        )
+        if name in metadata.tables
+        and not metadata.tables[name].info.get('counted')
+    ]
+    for name in tables:
+        for operation in ('insert', 'delete', 'truncate'):
+            connection.execute(
+                text(
+                    f'DROP TRIGGER IF EXISTS {name}_count_{operation} '
+                    f'ON {name}'
+                )
+            )
+        connection.execute(
+            text('DELETE FROM row_counts WHERE table_name = :name'),
+            dict(name=name),
+        )
+
+
+def maintain_sum(
+    column: Column,
+    target: Column,
+    /,
+    *keys: Tuple[Column, Column],
+) -> None:
+    """Maintain the `target` as the sum of the `column` of its rows.
+
+    The rows of the `column` are matched to the rows of the `target` by the
+    pairs of the `keys`. The sum is updated by the statement level triggers
+    of the table of the `column` in the same transaction as the write, so
+    reading it does not aggregate the rows.
+    """
+    source, table = column.table, target.table
+    name = (
+        'sum_'
+        + blake2b(f'{column} {target}'.encode(), digest_size=6).hexdigest()
+    )
+    group = ', '.join(key.name for key, _ in keys)
+    assignment = f'{target.name} = {table.name}.{target.name} + changes.delta'
+    if 'updated_at' in table.c:
+        assignment += ', updated_at = now()'
+
+    def update(changes: str, /) -> str:
+        return (
+            f'UPDATE {table.name} SET {assignment} '
+            f'FROM (SELECT {group}, sum(delta) AS delta FROM ({changes}) '
+            f'AS _ GROUP BY {group}) AS changes WHERE '
+            + ' AND '.join(
+                f'{table.name}.{other.name} = changes.{key.name}'
+                for key, other in keys
+            )
+            + ' AND changes.delta <> 0;'
+        )
+
+    new = f'SELECT {group}, {column.name} AS delta FROM new_rows'
+    old = f'SELECT {group}, -{column.name} AS delta FROM old_rows'
+    statements = [
+        f'CREATE OR REPLACE FUNCTION {name}() RETURNS trigger '
+        'LANGUAGE plpgsql AS $$ BEGIN '
+        f"IF TG_OP = 'INSERT' THEN {update(new)} "
+        f"ELSIF TG_OP = 'DELETE' THEN {update(old)} "
+        f'ELSE {update(f"{new} UNION ALL {old}")} '
+        'END IF; RETURN NULL; END $$'
+    ]
+    for event, references in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'NEW TABLE AS new_rows OLD TABLE AS old_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    ):
+        trigger = f'{name}_{event.lower()}'
+        statements.append(f'DROP TRIGGER IF EXISTS {trigger} ON {source.name}')
+        statements.append(
+            f'CREATE TRIGGER {trigger} AFTER {event} ON {source.name} '
+            f'REFERENCING {references} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION {name}()'
+        )
+    if not contains(source.metadata, 'after_create', _migrate_sums):
+        listen(source.metadata, 'after_create', _migrate_sums, insert=True)
+    for statement in statements:
+        listen(
+            source.metadata,
+            'after_create',
+            DDL(statement).execute_if(dialect='postgresql'),
+        )
+    target.info.setdefault('sums', []).append((column, keys))
+    source.info.setdefault('writes', set()).add(table)
+
+
+def get_sum_targets(metadata: MetaData, /) -> List[Column]:
+    """Return the columns maintained by :func:`maintain_sum`.
+
+    The dependent tables come first, so the sums of the sums are rebuilt
+    after the sums they are made of.
+    """
+    return [
+        column
+        for table in reversed(metadata.sorted_tables)
+        for column in table.columns
+        if column.info.get('sums')
+    ]
+
+
+def reconcile_sum(target: Column, /) -> Update:
+    """Return the statement rebuilding the `target` from the summed rows."""
+    table = target.table
+    parts = []
+    joins = []
+    for column, keys in target.info['sums']:
+        sums = (
+            select(
+                *(key for key, _ in keys),
+                func.sum(column).label('total'),
+            )
+            .group_by(*(key for key, _ in keys))
+            .subquery()
+        )
+        joins.append((sums, and_(*(sums.c[key.name] == _ for key, _ in keys))))
+        parts.append(func.coalesce(sums.c.total, 0))
+    totals = select(
+        *table.primary_key, sum(parts[1:], parts[0]).label('total')
+    )
+    for sums, onclause in joins:
+        totals = totals.outerjoin(sums, onclause)
+    totals = totals.subquery()
+
+    values = {target.name: totals.c.total}
+    if 'updated_at' in table.c:
+        values['updated_at'] = func.now()
+    return (
+        update(table)
+        .where(
+            *(_ == totals.c[_.name] for _ in table.primary_key),
+            target.is_distinct_from(totals.c.total),
+        )
+        .values(values)
+    )
+
+
+def _migrate_sums(
+    metadata: MetaData, connection: Connection, /, **kw: Any
+) -> None:
+    # The tables created before the sums were maintained lack the summed
+    # columns or have them narrower, so the columns are added or widened and
+    # the sums rebuilt before the triggers are installed.
+    if connection.dialect.name != 'postgresql':
+        return
+    targets = get_sum_targets(metadata)
+    columns = dict.fromkeys(
+        (
+            *targets,
+            *(
+                column
+                for target in targets
+                for column, _ in target.info['sums']
+            ),
+        )
+    )
+    types = {
+        (table, name): type_
+        for table, name, type_ in connection.execute(
+            text(
+                'SELECT c.relname, a.attname, '
+                'format_type(a.atttypid, a.atttypmod) FROM pg_attribute a '
+                'JOIN pg_class c ON c.oid = a.attrelid '
+                'WHERE c.relname = ANY(:tables) '
+                'AND pg_table_is_visible(c.oid) '
+                'AND a.attnum > 0 AND NOT a.attisdropped'
+            ),
+            dict(tables=sorted({_.table.name for _ in columns})),
+        )
+    }
+    added = False
+    for column in columns:
+        type_ = column.type.compile(dialect=connection.dialect)
+        current = types.get((column.table.name, column.name))
+        if current is None:
+            connection.execute(
+                text(
+                    f'ALTER TABLE {column.table.name} '
+                    f'ADD COLUMN {column.name} {type_}'
+                    + ('' if column.nullable else ' NOT NULL DEFAULT 0')
+                )
+            )
+            added = True
+        elif current.replace(' ', '') != type_.lower().replace(' ', ''):
+            connection.execute(
+                text(
+                    f'ALTER TABLE {column.table.name} '
+                    f'ALTER COLUMN {column.name} TYPE {type_}'
+                )
+            )
+    if added:
+        for target in targets:
+            connection.execute(reconcile_sum(target))
@@ -14,6 +14,9 @@ from typing import (
     Final,
     Iterable,
     List,
+    Optional,
+    Set,
+    Tuple,
     Type,
     Union,
 )
@@ -21,7 +24,6 @@ from uuid import UUID
 
 from inflect import engine
 from pydantic.main import BaseConfig, BaseModel, create_model
-from sqlalchemy.inspection import inspect
 from sqlalchemy.orm.decl_api import declarative_base, declared_attr
 from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.orm.relationships import RelationshipProperty
@@ -44,18 +46,11 @@ def serialize(
     encoding: str = 'utf8',
 ) -> Serializable:
     if isinstance(value, BaseInterface):
-        state: InstanceState = inspect(value)
-        serialized = {_.key: state.dict.get(_.key) for _ in value.columns}
-        for relationship in value.relationships:
-            _def = [] if relationship.uselist else None
-            if (_value := state.dict.get(relationship.key, _def)) in checked:
-                _value = None
-            elif isinstance(_value, list):
-                for checked_model in checked:
-                    while checked_model in _value:
-                        _value.remove(checked_model)
-            serialized[relationship.key] = _value
-        return serialize(serialized, (*checked, value))
+        return value.__class__.get_serializer()(
+            value, {id(_) for _ in checked}
+        )
+    elif (converter := _converters.get(value.__class__)) is not None:
+        return converter(value)
     elif isinstance(value, (type(None), bool, int, float, str)):
         return value
     elif isinstance(value, Decimal):
@@ -83,6 +78,69 @@ def serialize(
         raise TypeError(f'Unserializable type "{type(value)}": {value}')
 
 
+def compile_serializers(base: Type[BaseInterface], /) -> None:
+    """Compile the serializers of all the mapped classes of the `base`."""
+    for mapper in base.registry.mappers:
+        if issubclass(mapper.class_, BaseInterface):
+            mapper.class_.get_serializer()
+
+
+def _compile_serializer(
+    cls: Type[BaseInterface],
+    /,
+) -> Callable[[BaseInterface, Set[int]], Dict[str, Serializable]]:
+    columns: List[Tuple[str, Optional[Callable[[Any], Serializable]]]] = []
+    for column in cls.columns:
+        python_type = None
+        with suppress(NotImplementedError):
+            python_type = column.type.python_type
+        columns.append((column.key, _converters.get(python_type)))
+    relationships = [(_.key, _.uselist) for _ in cls.relationships]
+
+    def serializer(
+        value: BaseInterface,
+        ancestors: Set[int],
+        /,
+    ) -> Dict[str, Serializable]:
+        state_dict = value.__dict__
+        serialized: Dict[str, Serializable] = {}
+        for key, converter in columns:
+            _value = state_dict.get(key)
+            if converter is not None and _value is not None:
+                _value = converter(_value)
+            serialized[key] = _value
+
+        ancestors.add(id(value))
+        try:
+            for key, uselist in relationships:
+                _value = state_dict.get(key)
+                if uselist:
+                    serialized[key] = [
+                        _.__class__.get_serializer()(_, ancestors)
+                        for _ in _value or ()
+                        if id(_) not in ancestors
+                    ]
+                elif _value is None or id(_value) in ancestors:
+                    serialized[key] = None
+                else:
+                    serialized[key] = _value.__class__.get_serializer()(
+                        _value, ancestors
+                    )
+        finally:
+            ancestors.discard(id(value))
+        return serialized
+
+    return serializer
+
+
+#
+_converters: Final[Dict[Type[Any], Callable[[Any], Serializable]]] = {
+    Decimal: float,
+    timedelta: timedelta.total_seconds,
+    bytes: bytes.decode,
+}
+
+
 class _OrmConfig(BaseConfig):
     orm_mode: Final[bool] = True
 
@@ -183,6 +241,15 @@ class BaseInterface(object):
             raise ValueError(f'Could not infer type for {relationship}')
         return relationship_types
 
+    @classmethod
+    def get_serializer(
+        cls: Type[Self],
+        /,
+    ) -> Callable[[Self, Set[int]], Dict[str, Serializable]]:
+        if '_serializer' not in cls.__dict__:
+            cls._serializer = _compile_serializer(cls)
+        return cls._serializer
+
     @property
     def dict(self: Self, /) -> Dict[str, Any]:
         return {_.key: self.__dict__.get(_.key) for _ in self.columns} | {
@@ -39,7 +39,7 @@ class ContainerTankModel(Timestamped, Base):
         primary_key=True,
     )
     current_volume: Final[Column[Decimal]] = Column(
-        Numeric(8, 8),
+        Numeric(16, 6),
         nullable=False,
         default=Decimal(),
     )
@@ -6,7 +6,7 @@ from sqlalchemy.orm.relationships import RelationshipProperty
 from sqlalchemy.sql.schema import Column, ForeignKey
 from sqlalchemy.sql.sqltypes import Integer, Numeric
 
-from ....._mixins import Timestamped
+from ....._mixins import Timestamped, maintain_sum
 from .....base_interface import Base
 from .container_tank_company_opening_model import (
     ContainerTankCompanyOpeningModel,
@@ -29,7 +29,7 @@ class ContainerTankCompanyOpeningDropModel(Timestamped, Base):
         autoincrement=True,
     )
     volume: Final[Column[Decimal]] = Column(
-        Numeric(6, 6),
+        Numeric(12, 6),
         nullable=False,
     )
 
@@ -42,3 +42,13 @@ class ContainerTankCompanyOpeningDropModel(Timestamped, Base):
         cascade='save-update',
         uselist=False,
     )
+
+
+maintain_sum(
+    ContainerTankCompanyOpeningDropModel.__table__.c.volume,
+    ContainerTankCompanyOpeningModel.__table__.c.volume,
+    (
+        ContainerTankCompanyOpeningDropModel.__table__.c.opening_id,
+        ContainerTankCompanyOpeningModel.__table__.c.id,
+    ),
+)
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -5,21 +6,16 @@ from typing import (
     Final,
     Optional,
     Tuple,
-    Type,
     Union,
 )
 from uuid import UUID
 
-from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.relationships import RelationshipProperty
-from sqlalchemy.sql.elements import ClauseElement
-from sqlalchemy.sql.functions import func
 from sqlalchemy.sql.schema import Column, ForeignKeyConstraint, SchemaItem
-from sqlalchemy.sql.sqltypes import Integer
-from typing_extensions import Self
+from sqlalchemy.sql.sqltypes import Integer, Numeric
 
-from ....._mixins import Timestamped
+from ....._mixins import Counted, Timestamped, maintain_sum
 from .....base_interface import Base
 from .....companies.deals.additions.company_deal_addition_nomenclature_model import (
     CompanyDealAdditionNomenclatureModel,
@@ -35,7 +31,7 @@ if TYPE_CHECKING:
     )
 
 
-class ContainerTankCompanyOpeningModel(Timestamped, Base):
+class ContainerTankCompanyOpeningModel(Counted, Timestamped, Base):
     group_owner_id: Final[Column[UUID]] = Column(
         CompanyGroupMemberModel.group_owner_id.type,
         nullable=False,
@@ -67,15 +63,11 @@ class ContainerTankCompanyOpeningModel(Timestamped, Base):
         autoincrement=True,
     )
 
-    @hybrid_property
-    def volume(self: Self, /) -> int:  # noqa: D102
-        return sum(drop.volume for drop in self.drops) if self.drops else 0
-
-    @volume.expression
-    def volume(cls: Type[Self], /) -> ClauseElement:
-        return func.sum(
-            ContainerTankCompanyOpeningDropModel.volume
-        ).select_from(cls.drops)
+    volume: Final[Column[Decimal]] = Column(
+        Numeric(14, 6),
+        nullable=False,
+        default=Decimal(),
+    )
 
     group_member: Final[
         'RelationshipProperty[CompanyGroupMemberModel]'
@@ -138,3 +130,17 @@ class ContainerTankCompanyOpeningModel(Timestamped, Base):
             ondelete='NO ACTION',
         ),
     )
+
+
+maintain_sum(
+    ContainerTankCompanyOpeningModel.__table__.c.volume,
+    ContainerTankModel.__table__.c.current_volume,
+    (
+        ContainerTankCompanyOpeningModel.__table__.c.container_id,
+        ContainerTankModel.__table__.c.container_id,
+    ),
+    (
+        ContainerTankCompanyOpeningModel.__table__.c.tank_type_id,
+        ContainerTankModel.__table__.c.type_id,
+    ),
+)
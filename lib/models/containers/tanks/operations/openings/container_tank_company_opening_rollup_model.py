@@ -0,0 +1,62 @@
+from decimal import Decimal
+from typing import ClassVar, Final, Tuple
+from uuid import UUID
+
+from sqlalchemy.sql.schema import Column, Table
+from sqlalchemy.sql.sqltypes import Numeric
+
+from ....._mixins import Rollup
+from .....base_interface import Base
+from .container_tank_company_opening_drop_model import (
+    ContainerTankCompanyOpeningDropModel,
+)
+from .container_tank_company_opening_model import (
+    ContainerTankCompanyOpeningModel,
+)
+
+
+class ContainerTankCompanyOpeningRollupModel(Rollup, Base):
+    __abstract__: Final[bool] = True
+
+    rollup_source: ClassVar[Table] = ContainerTankCompanyOpeningModel.__table__
+    rollup_sums: ClassVar[Tuple[Column, ...]] = (
+        ContainerTankCompanyOpeningDropModel.__table__.c.volume,
+    )
+
+    container_id: Final[Column[int]] = Column(
+        ContainerTankCompanyOpeningModel.container_id.type,
+        primary_key=True,
+    )
+    tank_type_id: Final[Column[int]] = Column(
+        ContainerTankCompanyOpeningModel.tank_type_id.type,
+        primary_key=True,
+    )
+    group_owner_id: Final[Column[UUID]] = Column(
+        ContainerTankCompanyOpeningModel.group_owner_id.type,
+        primary_key=True,
+    )
+    group_member_id: Final[Column[int]] = Column(
+        ContainerTankCompanyOpeningModel.group_member_id.type,
+        primary_key=True,
+    )
+    nomenclature_id: Final[Column[int]] = Column(
+        ContainerTankCompanyOpeningModel.nomenclature_id.type,
+        primary_key=True,
+    )
+    volume: Final[Column[Decimal]] = Column(
+        Numeric(16, 6),
+        nullable=False,
+        default=Decimal(),
+    )
+
+
+class ContainerTankCompanyOpeningHourlyRollupModel(
+    ContainerTankCompanyOpeningRollupModel
+):
+    rollup_unit: ClassVar[str] = 'hour'
+
+
+class ContainerTankCompanyOpeningDailyRollupModel(
+    ContainerTankCompanyOpeningRollupModel
+):
+    rollup_unit: ClassVar[str] = 'day'
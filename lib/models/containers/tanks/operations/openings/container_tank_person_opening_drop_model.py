@@ -6,7 +6,7 @@ from sqlalchemy.orm.relationships import RelationshipProperty
 from sqlalchemy.sql.schema import Column, ForeignKey
 from sqlalchemy.sql.sqltypes import Integer, Numeric
 
-from ....._mixins import Timestamped
+from ....._mixins import Timestamped, maintain_sum
 from .....base_interface import Base
 from .container_tank_person_opening_model import (
     ContainerTankPersonOpeningModel,
@@ -29,7 +29,7 @@ class ContainerTankPersonOpeningDropModel(Timestamped, Base):
         autoincrement=True,
     )
     volume: Final[Column[Decimal]] = Column(
-        Numeric(6, 6),
+        Numeric(12, 6),
         nullable=False,
     )
 
@@ -42,3 +42,13 @@ class ContainerTankPersonOpeningDropModel(Timestamped, Base):
         cascade='save-update',
         uselist=False,
     )
+
+
+maintain_sum(
+    ContainerTankPersonOpeningDropModel.__table__.c.volume,
+    ContainerTankPersonOpeningModel.__table__.c.volume,
+    (
+        ContainerTankPersonOpeningDropModel.__table__.c.opening_id,
+        ContainerTankPersonOpeningModel.__table__.c.id,
+    ),
+)
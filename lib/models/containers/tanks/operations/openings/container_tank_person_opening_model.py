@@ -1,3 +1,4 @@
+from decimal import Decimal
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -5,25 +6,20 @@ from typing import (
     Final,
     Optional,
     Tuple,
-    Type,
     Union,
 )
 
-from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.relationships import RelationshipProperty
-from sqlalchemy.sql.elements import ClauseElement
-from sqlalchemy.sql.functions import func
 from sqlalchemy.sql.schema import (
     Column,
     ForeignKey,
     ForeignKeyConstraint,
     SchemaItem,
 )
-from sqlalchemy.sql.sqltypes import Integer
-from typing_extensions import Self
+from sqlalchemy.sql.sqltypes import Integer, Numeric
 
-from ....._mixins import Timestamped
+from ....._mixins import Counted, Timestamped, maintain_sum
 from .....base_interface import Base
 from .....people.deals.additions.person_deal_addition_nomenclature_model import (
     PersonDealAdditionNomenclatureModel,
@@ -37,7 +33,7 @@ if TYPE_CHECKING:
     )
 
 
-class ContainerTankPersonOpeningModel(Timestamped, Base):
+class ContainerTankPersonOpeningModel(Counted, Timestamped, Base):
     person_id: Final[Column[int]] = Column(
         PersonModel.user_id.type,
         ForeignKey(
@@ -68,15 +64,11 @@ class ContainerTankPersonOpeningModel(Timestamped, Base):
         autoincrement=True,
     )
 
-    @hybrid_property
-    def volume(self: Self, /) -> int:  # noqa: D102
-        return sum(drop.volume for drop in self.drops) if self.drops else 0
-
-    @volume.expression
-    def volume(cls: Type[Self], /) -> ClauseElement:
-        return func.sum(
-            ContainerTankPersonOpeningDropModel.volume
-        ).select_from(cls.drops)
+    volume: Final[Column[Decimal]] = Column(
+        Numeric(14, 6),
+        nullable=False,
+        default=Decimal(),
+    )
 
     person: Final['RelationshipProperty[PersonModel]'] = relationship(
         'PersonModel',
@@ -128,3 +120,17 @@ class ContainerTankPersonOpeningModel(Timestamped, Base):
             ondelete='NO ACTION',
         ),
     )
+
+
+maintain_sum(
+    ContainerTankPersonOpeningModel.__table__.c.volume,
+    ContainerTankModel.__table__.c.current_volume,
+    (
+        ContainerTankPersonOpeningModel.__table__.c.container_id,
+        ContainerTankModel.__table__.c.container_id,
+    ),
+    (
+        ContainerTankPersonOpeningModel.__table__.c.tank_type_id,
+        ContainerTankModel.__table__.c.type_id,
+    ),
+)
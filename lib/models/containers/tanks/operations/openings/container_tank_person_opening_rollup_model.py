@@ -0,0 +1,57 @@
+from decimal import Decimal
+from typing import ClassVar, Final, Tuple
+
+from sqlalchemy.sql.schema import Column, Table
+from sqlalchemy.sql.sqltypes import Numeric
+
+from ....._mixins import Rollup
+from .....base_interface import Base
+from .container_tank_person_opening_drop_model import (
+    ContainerTankPersonOpeningDropModel,
+)
+from .container_tank_person_opening_model import (
+    ContainerTankPersonOpeningModel,
+)
+
+
+class ContainerTankPersonOpeningRollupModel(Rollup, Base):
+    __abstract__: Final[bool] = True
+
+    rollup_source: ClassVar[Table] = ContainerTankPersonOpeningModel.__table__
+    rollup_sums: ClassVar[Tuple[Column, ...]] = (
+        ContainerTankPersonOpeningDropModel.__table__.c.volume,
+    )
+
+    container_id: Final[Column[int]] = Column(
+        ContainerTankPersonOpeningModel.container_id.type,
+        primary_key=True,
+    )
+    tank_type_id: Final[Column[int]] = Column(
+        ContainerTankPersonOpeningModel.tank_type_id.type,
+        primary_key=True,
+    )
+    person_id: Final[Column[int]] = Column(
+        ContainerTankPersonOpeningModel.person_id.type,
+        primary_key=True,
+    )
+    nomenclature_id: Final[Column[int]] = Column(
+        ContainerTankPersonOpeningModel.nomenclature_id.type,
+        primary_key=True,
+    )
+    volume: Final[Column[Decimal]] = Column(
+        Numeric(16, 6),
+        nullable=False,
+        default=Decimal(),
+    )
+
+
+class ContainerTankPersonOpeningHourlyRollupModel(
+    ContainerTankPersonOpeningRollupModel
+):
+    rollup_unit: ClassVar[str] = 'hour'
+
+
+class ContainerTankPersonOpeningDailyRollupModel(
+    ContainerTankPersonOpeningRollupModel
+):
+    rollup_unit: ClassVar[str] = 'day'
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Final, Optional
+
+from sqlalchemy.sql.schema import Column
+from sqlalchemy.sql.sqltypes import DateTime, String
+
+from ..base_interface import Base
+
+
+class RollupWatermarkModel(Base):
+    table_name: Final[Column[str]] = Column(
+        String(63),
+        primary_key=True,
+    )
+    watermark: Final[Column[Optional[datetime]]] = Column(
+        DateTime(timezone=True),
+    )
@@ -0,0 +1,23 @@
+from typing import Final
+
+from sqlalchemy.event.api import listen
+from sqlalchemy.sql.schema import Column
+from sqlalchemy.sql.sqltypes import BigInteger, String
+
+from .._mixins import uncount_tables
+from ..base_interface import Base
+
+
+class RowCountModel(Base):
+    table_name: Final[Column[str]] = Column(
+        String(63),
+        primary_key=True,
+    )
+    total: Final[Column[int]] = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+    )
+
+
+listen(RowCountModel.metadata, 'after_create', uncount_tables)
@@ -0,0 +1,91 @@
+"""The module with the production server of the application.
+
+Run it with ``python -m lib.server``. The server is configured with the
+environment variables:
+
+* ``PORT``, the port to listen on.
+* ``WEB_CONCURRENCY``, the number of the workers, one per core by default.
+* ``DATABASE_CONNECTIONS``, the total budget of the database connections
+  split evenly across the workers.
+* ``GRACEFUL_TIMEOUT``, the seconds given to the workers to drain the
+  requests in flight on ``SIGTERM``.
+
+The response cache of a worker is invalidated only by its own writes, so it
+is disabled by default with more than one worker. Set ``RESPONSE_CACHE_TTL``
+to accept the responses stale by the writes of the other workers for as many
+seconds.
+"""
+
+from asyncio import run
+from multiprocessing import cpu_count
+from os import environ
+from typing import Any, Dict, Final
+
+from gunicorn.app.base import BaseApplication
+from typing_extensions import Self
+
+
+class Server(BaseApplication):
+    """The server supervising the workers of the application.
+
+    The application is imported before the workers are forked, so the
+    mappers are configured and the tables and the visual schema are created
+    exactly once. The engine is disposed afterwards and every worker opens
+    its own connections.
+    """
+
+    options: Final[Dict[str, Any]]
+
+    def __init__(self: Self, /, **options: Any) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self: Self, /) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self: Self, /) -> Any:
+        from sqlalchemy.orm import configure_mappers
+
+        from . import main
+
+        configure_mappers()
+        run(self.bootstrap(main))
+        main.app.router.on_startup.remove(main._create_visual_schema)
+        return main.app
+
+    @staticmethod
+    async def bootstrap(main: Any, /) -> None:
+        try:
+            async with main.engine.begin() as connection:
+                await connection.run_sync(main.Base.metadata.create_all)
+            main.Base.metadata.bind = main.engine
+            await main._create_visual_schema()
+        finally:
+            await main.engine.dispose()
+            for replica in main.replicas:
+                await replica.dispose()
+
+
+def main() -> None:
+    workers = int(environ.get('WEB_CONCURRENCY', cpu_count()))
+    if connections := int(environ.get('DATABASE_CONNECTIONS', 0)):
+        environ.setdefault(
+            'DATABASE_POOL_SIZE', str(max(connections // workers, 1))
+        )
+        environ.setdefault('DATABASE_MAX_OVERFLOW', '0')
+    if workers > 1:
+        environ.setdefault('RESPONSE_CACHE_TTL', '0')
+
+    Server(
+        bind=f"0.0.0.0:{environ.get('PORT', 8000)}",
+        workers=workers,
+        worker_class='uvicorn.workers.UvicornWorker',
+        preload_app=True,
+        graceful_timeout=int(environ.get('GRACEFUL_TIMEOUT', 30)),
+        keepalive=5,
+    ).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""The module with the connection pool of the database engine."""
+
+from asyncio import gather
+from dataclasses import dataclass
+from functools import partial
+from logging import Logger
+from math import inf
+from time import monotonic, perf_counter
+from typing import Any, Dict, Final, Tuple
+
+from sqlalchemy.engine.interfaces import Dialect
+from sqlalchemy.event.api import listen
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio.engine import AsyncConnection, AsyncEngine
+from sqlalchemy.pool.base import _ConnectionFairy, _ConnectionRecord
+from sqlalchemy.pool.impl import AsyncAdaptedQueuePool
+from typing_extensions import Self
+
+#
+logger: Final[Logger] = Logger(__file__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The queue pool recording the wait time of its checkouts.
+
+    The overflow events are the checkouts that had to open a connection
+    beyond the size of the pool and the timeouts are the checkouts that gave
+    up waiting for a connection.
+    """
+
+    def __init__(self: Self, /, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats: Dict[str, float] = dict(
+            checkouts=0,
+            wait_total=0.0,
+            wait_max=0.0,
+            overflows=0,
+            timeouts=0,
+        )
+
+    def connect(self: Self, /) -> _ConnectionFairy:
+        overflow, start = self._overflow, perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self._stats['timeouts'] += 1
+            raise
+        wait = perf_counter() - start
+        self._stats['checkouts'] += 1
+        self._stats['wait_total'] += wait
+        self._stats['wait_max'] = max(self._stats['wait_max'], wait)
+        if self._overflow > max(overflow, 0):
+            self._stats['overflows'] += 1
+        return connection
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(
+            wait_average=self._stats['wait_total'] / checkouts
+            if (checkouts := self._stats['checkouts'])
+            else 0.0,
+            size=self.size(),
+            max_overflow=self._max_overflow,
+            idle=self.checkedin(),
+            in_use=self.checkedout(),
+            overflow=max(self.overflow(), 0),
+        )
+
+
+@dataclass(init=False, frozen=True)
+class PoolManager(object):
+    """The manager of the connection pools of the `engine` and `replicas`.
+
+    The `warmup` connections are opened on the start so the first requests
+    do not pay for the connection. Instead of pinging every connection on
+    the checkout, only the connections idle for more than `interval` of
+    seconds are probed on their checkout and the broken ones are replaced,
+    so the probes never hold the connections the requests are waiting for.
+    """
+
+    engine: Final[AsyncEngine]
+    replicas: Final[Tuple[AsyncEngine, ...]]
+    warmup: Final[int]
+    interval: Final[float]
+    _stats: Final[Dict[str, int]]
+
+    def __init__(
+        self: Self,
+        engine: AsyncEngine,
+        /,
+        *replicas: AsyncEngine,
+        warmup: int = 0,
+        interval: float = 30,
+    ) -> None:
+        object.__setattr__(self, 'engine', engine)
+        object.__setattr__(self, 'replicas', replicas)
+        object.__setattr__(self, 'warmup', warmup)
+        object.__setattr__(self, 'interval', interval)
+        object.__setattr__(self, '_stats', dict(probes=0, invalidated=0))
+        if interval > 0:
+            for _engine in (engine, *replicas):
+                listen(_engine.sync_engine.pool, 'checkin', self._checkin)
+                listen(
+                    _engine.sync_engine.pool,
+                    'checkout',
+                    partial(self._checkout, _engine.dialect),
+                )
+
+    async def start(self: Self, /) -> None:
+        if self.warmup > 0:
+            logger.info(f'Connection pool warm-up of {self.warmup}.')
+            connections = await gather(
+                *(self.engine.connect() for _ in range(self.warmup)),
+                return_exceptions=True,
+            )
+            for connection in connections:
+                if not isinstance(connection, AsyncConnection):
+                    logger.warning(f'Connection failed: {connection!r}')
+                    continue
+                await connection.close()
+
+    @staticmethod
+    def _checkin(dbapi_connection: Any, record: _ConnectionRecord, /) -> None:
+        record.info['checkin'] = monotonic()
+
+    def _checkout(
+        self: Self,
+        dialect: Dialect,
+        dbapi_connection: Any,
+        record: _ConnectionRecord,
+        proxy: _ConnectionFairy,
+        /,
+    ) -> None:
+        # The fresh connections have never been checked in.
+        if monotonic() - record.info.get('checkin', inf) <= self.interval:
+            return
+        self._stats['probes'] += 1
+        if not dialect.do_ping(dbapi_connection):
+            self._stats['invalidated'] += 1
+            logger.warning('Connection invalidated on checkout.')
+            raise DisconnectionError()
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return (
+            getattr(self.engine.sync_engine.pool, 'stats', {})
+            | self._stats
+            | dict(
+                warmup=self.warmup,
+                interval=self.interval,
+                replicas=[
+                    getattr(_.sync_engine.pool, 'stats', {})
+                    for _ in self.replicas
+                ],
+            )
+        )
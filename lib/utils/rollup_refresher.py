@@ -0,0 +1,193 @@
+"""The module with the incremental refresh of the rollups."""
+
+from asyncio import CancelledError, Lock, Task, create_task, sleep
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from logging import Logger
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    FrozenSet,
+    List,
+    Sequence,
+    Type,
+)
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio.engine import AsyncConnection, AsyncEngine
+from sqlalchemy.sql.elements import literal_column
+from sqlalchemy.sql.expression import delete, select, update
+from sqlalchemy.sql.functions import func
+from sqlalchemy.sql.schema import Table
+from typing_extensions import Self
+
+from ..models._mixins import Rollup
+from ..models.misc.rollup_watermark_model import RollupWatermarkModel
+
+#
+logger: Final[Logger] = Logger(__file__)
+
+
+@dataclass(init=False, frozen=True)
+class RollupRefresher(object):
+    """The refresher of the `rollups` each `interval` of seconds.
+
+    Only the rows created since the watermark of the rollup and at least
+    `lag` seconds ago are added to the buckets, so the transactions in flight
+    have the time to commit their rows. The sources are expected to be only
+    appended to, so the rollups should be rebuilt after their rows change.
+    The `listeners` are called with the tables of the refreshed rollups.
+    """
+
+    engine: Final[AsyncEngine]
+    rollups: Final[Sequence[Type[Rollup]]]
+    interval: Final[float]
+    lag: Final[float]
+    listeners: Final[List[Callable[[FrozenSet[Table]], Any]]]
+    _lock: Final[Lock]
+    _task: Final[List[Task]]
+    _stats: Final[Dict[str, Any]]
+
+    def __init__(
+        self: Self,
+        engine: AsyncEngine,
+        rollups: Sequence[Type[Rollup]],
+        /,
+        *,
+        interval: float = 60,
+        lag: float = 60,
+    ) -> None:
+        object.__setattr__(self, 'engine', engine)
+        object.__setattr__(self, 'rollups', tuple(rollups))
+        object.__setattr__(self, 'interval', interval)
+        object.__setattr__(self, 'lag', lag)
+        object.__setattr__(self, 'listeners', [])
+        object.__setattr__(self, '_lock', Lock())
+        object.__setattr__(self, '_task', [])
+        object.__setattr__(
+            self, '_stats', dict(refreshes=0, rows=0, failures=0)
+        )
+
+    async def start(self: Self, /) -> None:
+        if self.interval > 0 and self.rollups and not self._task:
+            self._task.append(create_task(self._run()))
+
+    async def stop(self: Self, /) -> None:
+        while self._task:
+            task = self._task.pop()
+            task.cancel()
+            try:
+                await task
+            except CancelledError:
+                pass
+
+    async def refresh(
+        self: Self, /, *, rebuild: bool = False
+    ) -> Dict[str, int]:
+        """Return the count of the buckets updated in each of the rollups."""
+        async with self._lock:
+            refreshed: Dict[str, int] = {}
+            for rollup in self.rollups:
+                async with self.engine.begin() as connection:
+                    refreshed[rollup.__table__.name] = await self._refresh(
+                        connection, rollup, rebuild=rebuild
+                    )
+            self._stats['refreshes'] += 1
+            self._stats['rows'] += sum(refreshed.values())
+
+        if tables := frozenset(
+            rollup.__table__
+            for rollup in self.rollups
+            if refreshed[rollup.__table__.name]
+        ):
+            for listener in self.listeners:
+                listener(tables)
+        return refreshed
+
+    async def _refresh(
+        self: Self,
+        connection: AsyncConnection,
+        rollup: Type[Rollup],
+        /,
+        *,
+        rebuild: bool = False,
+    ) -> int:
+        table, source = rollup.__table__, rollup.rollup_source
+        watermarks = RollupWatermarkModel.__table__
+        await connection.execute(
+            pg_insert(watermarks)
+            .values(table_name=table.name)
+            .on_conflict_do_nothing()
+        )
+        # The lock serializes the refreshes of the workers.
+        watermark = await connection.scalar(
+            select(watermarks.c.watermark)
+            .where(watermarks.c.table_name == table.name)
+            .with_for_update()
+        )
+        if rebuild:
+            await connection.execute(delete(table))
+            watermark = None
+        until = datetime.now(timezone.utc) - timedelta(seconds=self.lag)
+        if watermark is not None and watermark >= until:
+            return 0
+
+        # The unit is inlined, so the buckets are grouped by the same
+        # expression as they are selected with.
+        keys = [_ for _ in table.primary_key if _.name != 'bucket']
+        rows = 0
+        for column in (None, *rollup.rollup_sums):
+            counted = source if column is None else column.table
+            bucket = func.date_trunc(
+                literal_column(f"'{rollup.rollup_unit}'"),
+                counted.c.created_at,
+                literal_column("'UTC'"),
+            )
+            query = (
+                select(
+                    bucket,
+                    *(source.c[_.name] for _ in keys),
+                    func.count() if column is None else func.sum(column),
+                )
+                .select_from(
+                    source if counted is source else counted.join(source)
+                )
+                .where(counted.c.created_at <= until)
+                .group_by(bucket, *(source.c[_.name] for _ in keys))
+            )
+            if watermark is not None:
+                query = query.where(counted.c.created_at > watermark)
+
+            name = 'count' if column is None else column.name
+            statement = pg_insert(table).from_select(
+                ['bucket', *(_.name for _ in keys), name], query
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=list(table.primary_key),
+                set_={name: table.c[name] + statement.excluded[name]},
+            )
+            rows += (await connection.execute(statement)).rowcount
+
+        await connection.execute(
+            update(watermarks)
+            .where(watermarks.c.table_name == table.name)
+            .values(watermark=until)
+        )
+        return rows
+
+    async def _run(self: Self, /) -> None:
+        while True:
+            await sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as _:
+                self._stats['failures'] += 1
+                logger.exception(f'Rollup refresh failed: {_!r}')
+
+    @property
+    def stats(self: Self, /) -> Dict[str, Any]:
+        return self._stats | dict(
+            rollups=len(self.rollups), interval=self.interval, lag=self.lag
+        )
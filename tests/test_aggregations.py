@@ -0,0 +1,76 @@
+from fastapi.exceptions import HTTPException
+from pytest import mark, raises
+from sqlalchemy.dialects.postgresql import dialect
+
+from lib.methods.endpoint import EndPointStatementBuilder
+from lib.models import ContainerTankPersonOpeningDropModel
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=dialect()))
+
+
+def test_group_by_relationship_column() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningDropModel,
+        'select=opening.container_id,day(created_at),sum(volume)'
+        '&group_by=opening.container_id,day(created_at)',
+    )
+    sql = _compile(plan.statement)
+    assert plan.named
+    assert (
+        'sum(container_tank_person_opening_drops.volume) AS "sum(volume)"'
+    ) in sql
+    assert (
+        'LEFT OUTER JOIN container_tank_person_openings ON '
+        'container_tank_person_openings.id = '
+        'container_tank_person_opening_drops.opening_id'
+    ) in sql
+    assert sql.endswith(
+        'GROUP BY container_tank_person_openings.container_id, '
+        "date_trunc('day', container_tank_person_opening_drops.created_at)"
+    )
+
+
+def test_having() -> None:
+    plan, params = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningDropModel,
+        'opening_id=1&select=opening_id,count(*)&group_by=opening_id'
+        '&having=count(*)>10',
+    )
+    sql = _compile(plan.statement)
+    assert (
+        'WHERE container_tank_person_opening_drops.opening_id = %(p0)s'
+    ) in sql
+    assert sql.endswith('HAVING count(*) > %(count_1)s')
+    assert list(params.values()) == [1]
+
+
+def test_count_of_groups() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningDropModel,
+        'select=opening_id,sum(volume)&group_by=opening_id',
+        count='exact',
+    )
+    sql = _compile(plan.statement)
+    assert sql.startswith('SELECT count(*) AS count_1 \nFROM (SELECT')
+    assert 'GROUP BY' in sql
+
+
+@mark.parametrize(
+    'query',
+    [
+        'group_by=opening_id',
+        'select=opening_id,sum(volume)&group_by=sum(volume)',
+        'select=sum(max(volume))',
+        'select=median(volume)',
+        'select=opening_id&having=sum(volume)>x',
+        'select=opening_id&having=sum(volume)',
+    ],
+)
+def test_invalid_aggregation(query: str) -> None:
+    with raises(HTTPException) as error:
+        EndPointStatementBuilder.select(
+            ContainerTankPersonOpeningDropModel, query
+        )
+    assert error.value.status_code == 400
@@ -0,0 +1,89 @@
+from asyncio import run
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from fastapi.responses import ORJSONResponse
+
+from lib.methods.endpoint import EndPoint
+from lib.models import TextModel
+
+UPDATED_AT = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+
+
+class _Session(object):
+    def __init__(self, *row: Any) -> None:
+        self.row = row
+
+    async def execute(self, statement: Any, params: Dict[str, Any]) -> Any:
+        return SimpleNamespace(one=lambda: self.row)
+
+
+def _get_endpoint(**headers: str) -> Any:
+    return SimpleNamespace(
+        request=SimpleNamespace(
+            headers={
+                _.replace('_', '-'): value for _, value in headers.items()
+            }
+        ),
+        _get_query=lambda: '',
+    )
+
+
+def _get_validators(*row: Any) -> Dict[str, str]:
+    return run(
+        EndPoint._get_validators(
+            _get_endpoint(),
+            _Session(*row),
+            TextModel,
+            ('texts', '', ORJSONResponse),
+        )
+    )
+
+
+def test_validators() -> None:
+    headers = _get_validators(UPDATED_AT, 2)
+    assert headers['ETag'].startswith('W/"')
+    assert headers['Last-Modified'] == 'Tue, 02 Jan 2024 01:04:05 GMT'
+    assert _get_validators(UPDATED_AT, 1)['ETag'] != headers['ETag']
+    assert 'Last-Modified' not in _get_validators(None, 0)
+
+
+def test_if_none_match() -> None:
+    headers = _get_validators(UPDATED_AT, 2)
+    etag = headers['ETag']
+    for if_none_match in (etag, etag.removeprefix('W/'), f'"x", {etag}', '*'):
+        assert EndPoint._is_not_modified(
+            _get_endpoint(If_None_Match=if_none_match), headers
+        )
+    assert not EndPoint._is_not_modified(
+        _get_endpoint(If_None_Match='"x"'), headers
+    )
+    # The tag takes precedence over the timestamp.
+    assert not EndPoint._is_not_modified(
+        _get_endpoint(
+            If_None_Match='"x"',
+            If_Modified_Since=headers['Last-Modified'],
+        ),
+        headers,
+    )
+
+
+def test_if_modified_since() -> None:
+    headers = _get_validators(UPDATED_AT, 2)
+    for if_modified_since, expected in (
+        ('Tue, 02 Jan 2024 01:04:05 GMT', True),
+        ('Wed, 03 Jan 2024 00:00:00 GMT', True),
+        ('Tue, 02 Jan 2024 01:04:04 GMT', False),
+        ('invalid', False),
+    ):
+        assert (
+            EndPoint._is_not_modified(
+                _get_endpoint(If_Modified_Since=if_modified_since), headers
+            )
+            is expected
+        )
+    assert not EndPoint._is_not_modified(
+        _get_endpoint(If_Modified_Since='Tue, 02 Jan 2024 01:04:05 GMT'),
+        {'ETag': headers['ETag']},
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy.dialects.postgresql import dialect
+
+from lib.methods.endpoint import EndPointStatementBuilder
+from lib.models import (
+    ContainerTankPersonOpeningDropModel,
+    ContainerTankPersonOpeningModel,
+)
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=dialect()))
+
+
+def test_count_of_counted_table() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningModel, '', count='exact'
+    )
+    assert _compile(plan.statement).startswith(
+        'SELECT row_counts.total \nFROM row_counts'
+    )
+    # The filtered rows are still counted by the table.
+    plan, _ = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningModel, 'person_id=1', count='exact'
+    )
+    assert 'row_counts' not in _compile(plan.statement)
+
+
+def test_count_of_other_table() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningDropModel, '', count='exact'
+    )
+    assert 'row_counts' not in _compile(plan.statement)
+
+    plan, _ = EndPointStatementBuilder.select(
+        ContainerTankPersonOpeningDropModel, '', count='exists'
+    )
+    assert _compile(plan.statement).startswith('SELECT EXISTS (SELECT')
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+from fastapi.exceptions import HTTPException
+from pytest import raises
+from sqlalchemy.dialects.postgresql import dialect
+
+from lib.methods.endpoint import EndPointStatementBuilder
+from lib.models import TextModel
+
+
+def test_cursor_roundtrip() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        TextModel, 'created_at..', limit=10, cursor=[]
+    )
+    created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    token = EndPointStatementBuilder.encode_cursor(
+        plan, TextModel(key='a b/c', created_at=created_at)
+    )
+    assert '=' not in token
+
+    _, params = EndPointStatementBuilder.select(
+        TextModel,
+        'created_at..',
+        limit=10,
+        cursor=EndPointStatementBuilder.decode_cursor(token),
+    )
+    assert params['c0'] == created_at
+    assert params['c1'] == 'a b/c'
+
+
+def test_cursor_keyset_ends_with_primary_key() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        TextModel, 'created_at..', limit=10, cursor=[]
+    )
+    assert [
+        (column.key, descending) for column, descending, _ in plan.keys
+    ] == [
+        ('created_at', True),
+        ('key', False),
+    ]
+
+
+def test_cursor_seeks_after_last_row() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        TextModel, 'key.', limit=10, cursor=['a']
+    )
+    sql = str(plan.statement.compile(dialect=dialect()))
+    assert '(texts.key) > (%(c0)s)' in sql
+    assert 'ORDER BY texts.key ASC' in sql
+
+    plan, _ = EndPointStatementBuilder.select(
+        TextModel, 'created_at..', limit=10, cursor=['2024-01-02', 'a']
+    )
+    sql = str(plan.statement.compile(dialect=dialect()))
+    assert (
+        'texts.created_at < %(c0)s OR '
+        'texts.created_at = %(c0)s AND texts.key > %(c1)s'
+    ) in sql
+
+
+def test_cursor_rejects_invalid_tokens() -> None:
+    for token in ('!', 'e30', 'WzFd'):
+        with raises(HTTPException) as error:
+            EndPointStatementBuilder.decode_cursor(token)
+        assert error.value.status_code == 400
+
+    with raises(HTTPException):
+        EndPointStatementBuilder.select(
+            TextModel, 'key.', limit=10, cursor=['a', 'b']
+        )
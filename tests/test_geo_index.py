@@ -0,0 +1,88 @@
+from random import Random
+from typing import List, Optional, Tuple
+
+from pytest import approx, mark
+
+from lib.methods._geo_index import GeoIndex, haversine
+from lib.models import ContainerModel
+
+
+def _get_index(points: List[Tuple[float, float]], /, **kwargs) -> GeoIndex:
+    index = GeoIndex(
+        ContainerModel.__table__.c.id,
+        ContainerModel.__table__.c.latitude,
+        ContainerModel.__table__.c.longtitude,
+        **kwargs,
+    )
+    for key, (latitude, longitude) in enumerate(points):
+        row, column = index._get_cell(latitude, longitude)
+        if (row, column) not in index._cells:
+            index._blocks.setdefault(
+                (row // index.block, column // index.block), []
+            ).append((row, column))
+        index._cells.setdefault((row, column), []).append(
+            (key, latitude, longitude)
+        )
+    return index
+
+
+def _get_nearest(
+    points: List[Tuple[float, float]],
+    latitude: float,
+    longitude: float,
+    /,
+    k: int,
+    radius: Optional[float] = None,
+) -> List[float]:
+    distances = sorted(haversine(latitude, longitude, *_) for _ in points)
+    return [_ for _ in distances if radius is None or _ <= radius][:k]
+
+
+@mark.parametrize(
+    'latitudes, longitudes',
+    [
+        ((-90, 90), ((-180, 180),)),
+        # The points on both sides of the antimeridian.
+        ((-60, 60), ((178, 180), (-180, -178))),
+        ((80, 90), ((-180, 180),)),
+    ],
+)
+def test_near_matches_brute_force(
+    latitudes: Tuple[float, float],
+    longitudes: Tuple[Tuple[float, float], ...],
+) -> None:
+    random = Random(0)
+    for _ in range(300):
+        points = [
+            (
+                random.uniform(*latitudes),
+                random.uniform(*random.choice(longitudes)),
+            )
+            for _ in range(random.randint(1, 50))
+        ]
+        index = _get_index(
+            points,
+            cell=random.choice((0.05, 0.5, 3, 10)),
+            block=random.choice((1, 4, 16)),
+        )
+        latitude = random.uniform(*latitudes)
+        longitude = random.uniform(*random.choice(longitudes))
+        k = random.randint(1, 8)
+        radius = random.choice((None, random.uniform(10, 3000)))
+        assert [
+            distance
+            for _, distance in index.near(latitude, longitude, k, radius)
+        ] == approx(_get_nearest(points, latitude, longitude, k, radius))
+
+
+def test_near_skips_empty_cells() -> None:
+    points = [(50.45 + _ / 1000, 30.52 + _ / 1000) for _ in range(20)]
+    index = _get_index([*points, (0, 0)])
+    nearest = index.near(50.45, 30.52, 21)
+    assert nearest[-1][0] == 20
+    assert index.stats['visits'] <= 21
+
+
+def test_near_empty() -> None:
+    assert _get_index([]).near(0, 0, 10) == []
+    assert _get_index([(0, 0)]).near(0, 0, 0) == []
@@ -0,0 +1,87 @@
+from asyncio import run
+from types import SimpleNamespace
+from typing import Any, Dict, FrozenSet, List
+
+from fastapi.exceptions import HTTPException
+from pytest import raises
+from sqlalchemy.dialects.postgresql import dialect
+from sqlalchemy.sql.schema import Table
+
+from lib.methods.endpoint import EndPoint
+from lib.models import TextModel
+
+
+class _Session(object):
+    def __init__(self) -> None:
+        self.executed: List[Any] = []
+
+    async def execute(self, statement: Any, params: List[Any]) -> None:
+        self.executed.append((statement, params))
+
+
+def _get_endpoint(copy_threshold: int) -> Any:
+    endpoint = SimpleNamespace(
+        Session=_Session(), copy_threshold=copy_threshold, copied=[]
+    )
+
+    async def copy_rows(
+        table: Table, keys: FrozenSet[str], rows: List[Dict[str, Any]]
+    ) -> None:
+        endpoint.copied.append((table, keys, rows))
+
+    endpoint._copy_rows = copy_rows
+    return endpoint
+
+
+def test_rows_of_flat_items() -> None:
+    item = dict(key='a', fallback='b')
+    assert EndPoint._get_rows(SimpleNamespace(), TextModel, item) == [item]
+
+
+def test_rows_of_nested_items() -> None:
+    locale = dict(
+        locale_language_code='uk', locale_country_code='UA', value='x'
+    )
+    assert (
+        EndPoint._get_rows(
+            SimpleNamespace(),
+            TextModel,
+            [
+                dict(key='a', fallback='b'),
+                dict(key='c', fallback='d', locales=[locale]),
+            ],
+        )
+        is None
+    )
+
+
+def test_rows_reject_scalars() -> None:
+    with raises(HTTPException) as error:
+        EndPoint._get_rows(SimpleNamespace(), TextModel, [1])
+    assert error.value.status_code == 400
+
+
+def test_insert_rows_grouped_by_keys() -> None:
+    endpoint = _get_endpoint(copy_threshold=1000)
+    rows = [dict(key='a', fallback='b'), dict(key='c'), dict(key='d')]
+    run(EndPoint._insert_rows(endpoint, TextModel, rows))
+    assert not endpoint.copied
+    assert [params for _, params in endpoint.Session.executed] == [
+        rows[:1],
+        rows[1:],
+    ]
+    statement, _ = endpoint.Session.executed[0]
+    assert str(statement.compile(dialect=dialect())) == (
+        'INSERT INTO texts (key, fallback, created_at, updated_at) '
+        'VALUES (%(key)s, %(fallback)s, %(created_at)s, %(updated_at)s)'
+    )
+
+
+def test_insert_rows_copied_above_threshold() -> None:
+    endpoint = _get_endpoint(copy_threshold=2)
+    rows = [dict(key='a', fallback='b'), dict(key='c'), dict(key='d')]
+    run(EndPoint._insert_rows(endpoint, TextModel, rows))
+    assert endpoint.copied == [
+        (TextModel.__table__, frozenset({'key'}), rows[1:])
+    ]
+    assert [params for _, params in endpoint.Session.executed] == [rows[:1]]
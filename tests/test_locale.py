@@ -0,0 +1,73 @@
+from fastapi.exceptions import HTTPException
+from pytest import mark, raises
+from sqlalchemy.dialects.postgresql import dialect
+
+from lib.methods.endpoint import EndPointStatementBuilder
+from lib.models import TextLocaleModel, TextModel
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=dialect()))
+
+
+def test_validator_of_fallback_locale() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'locale=*')
+    sql = _compile(EndPointStatementBuilder._get_validator(plan.statement))
+    assert 'text_locales_1.updated_at' in sql
+    assert 'FROM texts LEFT OUTER JOIN settings' in sql
+    assert 'text_locales,' not in sql
+    assert 'text_locales.updated_at' not in sql
+
+
+def test_validator_of_locale() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'locale=uk-UA')
+    sql = _compile(EndPointStatementBuilder._get_validator(plan.statement))
+    assert 'text_locales.updated_at' in sql
+    assert 'text_locales_1.updated_at' in sql
+    assert 'settings.updated_at' in sql
+    assert 'FROM texts LEFT OUTER JOIN text_locales ON' in sql
+
+
+def test_select_of_fallback_locale() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'locale=*')
+    sql = _compile(plan.statement)
+    assert plan.named
+    assert 'coalesce(text_locales_1.value, texts.fallback) AS value' in sql
+    assert 'FROM texts LEFT OUTER JOIN settings ON settings.id' in sql
+    assert (
+        'LEFT OUTER JOIN text_locales AS text_locales_1 ON '
+        'text_locales_1.text_key = texts.key AND '
+        'text_locales_1.locale_language_code = '
+        'settings.fallback_locale_language_code'
+    ) in sql
+
+
+def test_select_of_locale() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'locale=uk-UA')
+    compiled = plan.statement.compile(dialect=dialect())
+    assert (
+        'coalesce(text_locales.value, text_locales_1.value, texts.fallback) '
+        'AS value'
+    ) in str(compiled)
+    assert (
+        'FROM texts LEFT OUTER JOIN text_locales ON '
+        'text_locales.text_key = texts.key'
+    ) in str(compiled)
+    assert {'uk', 'UA'} <= set(compiled.params.values())
+    assert (
+        EndPointStatementBuilder.select(TextModel, 'locale=de-DE')[0]
+        is not plan
+    )
+
+
+def test_select_of_locales() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'locales')
+    assert not plan.named
+    assert TextLocaleModel.__table__ in plan.tables
+
+
+@mark.parametrize('query', ['locale=uk', 'locale=*&select=key'])
+def test_invalid_locale(query: str) -> None:
+    with raises(HTTPException) as error:
+        EndPointStatementBuilder.select(TextModel, query)
+    assert error.value.status_code == 400
@@ -0,0 +1,49 @@
+from sqlalchemy.sql.expression import select
+
+from lib.methods._plan_cache import PlanCache, StatementPlan
+from lib.methods.endpoint import EndPointStatementBuilder
+from lib.models import TextLocaleModel, TextModel
+
+
+def test_plan_cache_evicts_least_recently_used() -> None:
+    cache = PlanCache(maxsize=2)
+    plans = [StatementPlan(select(TextModel), False, ()) for _ in range(3)]
+    cache.set('a', plans[0])
+    cache.set('b', plans[1])
+    assert cache.get('a') is plans[0]
+    cache.set('c', plans[2])
+    assert cache.get('b') is None
+    assert cache.get('a') is plans[0]
+    assert cache.get('c') is plans[2]
+    assert cache.stats['evictions'] == 1
+
+
+def test_plan_tables_include_loads() -> None:
+    plan = StatementPlan(
+        select(TextModel),
+        False,
+        (),
+        loads=frozenset({TextLocaleModel.__table__}),
+    )
+    assert plan.tables == {TextModel.__table__, TextLocaleModel.__table__}
+
+
+def test_select_reuses_plan_of_same_shape() -> None:
+    plan, params = EndPointStatementBuilder.select(TextModel, 'key=a')
+    other, other_params = EndPointStatementBuilder.select(TextModel, 'key=b')
+    assert other is plan
+    assert list(params.values()) == ['a']
+    assert list(other_params.values()) == ['b']
+
+
+def test_select_keys_plan_by_shape() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'key=a')
+    assert (
+        EndPointStatementBuilder.select(TextModel, 'fallback=a')[0] is not plan
+    )
+    assert EndPointStatementBuilder.select(TextModel, 'key!=a')[0] is not plan
+    assert (
+        EndPointStatementBuilder.select(TextModel, 'key=a', limit=1)[0]
+        is not plan
+    )
+    assert EndPointStatementBuilder.select(TextModel, 'key=a')[0] is plan
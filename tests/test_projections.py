@@ -0,0 +1,48 @@
+from fastapi.exceptions import HTTPException
+from pytest import raises
+from sqlalchemy.dialects.postgresql import dialect
+
+from lib.methods.endpoint import EndPointStatementBuilder
+from lib.models import TextModel
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=dialect()))
+
+
+def test_select_projects_named_columns() -> None:
+    plan, _ = EndPointStatementBuilder.select(TextModel, 'select=key,fallback')
+    assert plan.named
+    assert _compile(plan.statement) == (
+        'SELECT texts.key AS key, texts.fallback AS fallback \nFROM texts'
+    )
+
+
+def test_select_joins_relationship_columns() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        TextModel, 'select=key,locales.value'
+    )
+    sql = _compile(plan.statement)
+    assert 'text_locales.value AS "locales.value"' in sql
+    assert 'FROM texts LEFT OUTER JOIN text_locales ON' in sql
+
+
+def test_select_counts_projection() -> None:
+    plan, _ = EndPointStatementBuilder.select(
+        TextModel, 'select=key', count='exact'
+    )
+    assert _compile(plan.statement).startswith(
+        'SELECT count(*) AS count_1 \nFROM (SELECT texts.key AS key'
+    )
+
+
+def test_select_rejects_relationships() -> None:
+    with raises(HTTPException) as error:
+        EndPointStatementBuilder.select(TextModel, 'select=locales')
+    assert error.value.status_code == 400
+
+
+def test_select_rejects_bare_fields() -> None:
+    with raises(HTTPException) as error:
+        EndPointStatementBuilder.select(TextModel, 'key&select=key')
+    assert error.value.status_code == 400
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from starlette.responses import Response
+
+from lib.methods._response_cache import ResponseCache
+from lib.methods.endpoint import EndPoint
+from lib.models import (
+    ContainerTankModel,
+    ContainerTankPersonOpeningDropModel,
+    ContainerTankPersonOpeningModel,
+    LocaleModel,
+    TextLocaleModel,
+    TextModel,
+)
+
+TEXTS = TextModel.__table__
+TEXT_LOCALES = TextLocaleModel.__table__
+
+
+def test_response_cache_stores_encoded_response() -> None:
+    cache = ResponseCache()
+    cache.set(
+        'a', Response(b'[]', media_type='application/json'), frozenset({TEXTS})
+    )
+    response = cache.get('a')
+    assert response.body == b'[]'
+    assert response.media_type == 'application/json'
+    assert cache.get('b') is None
+    assert cache.stats['hits'] == cache.stats['misses'] == 1
+
+
+def test_response_cache_expires() -> None:
+    cache = ResponseCache(ttl=60)
+    with patch('lib.methods._response_cache.monotonic', return_value=0):
+        cache.set('a', Response(b'[]'), frozenset({TEXTS}))
+    with patch('lib.methods._response_cache.monotonic', return_value=60):
+        assert cache.get('a') is None
+    assert cache.stats['size'] == 0
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(maxsize=2)
+    for key in 'abc':
+        cache.set(key, Response(key.encode()), frozenset({TEXTS}))
+        cache.get('a')
+    assert cache.get('b') is None
+    assert cache.get('a').body == b'a'
+    assert cache.get('c').body == b'c'
+    assert cache.stats['evictions'] == 1
+
+
+def test_response_cache_invalidates_by_table() -> None:
+    cache = ResponseCache()
+    cache.set('a', Response(b'a'), frozenset({TEXTS}))
+    cache.set('b', Response(b'b'), frozenset({TEXTS, TEXT_LOCALES}))
+    cache.set('c', Response(b'c'), frozenset({LocaleModel.__table__}))
+    cache.invalidate([TEXT_LOCALES])
+    assert cache.get('a').body == b'a'
+    assert cache.get('b') is None
+    assert cache.get('c').body == b'c'
+    assert cache.stats['invalidations'] == 1
+
+
+def test_response_cache_skips_stale_response() -> None:
+    cache = ResponseCache()
+    generation = cache.get_generation({TEXTS})
+    cache.invalidate([TEXTS])
+    cache.set('a', Response(b'a'), frozenset({TEXTS}), generation)
+    assert cache.get('a') is None
+    assert cache.stats['stale'] == 1
+
+
+def test_response_cache_disabled() -> None:
+    cache = ResponseCache(ttl=0)
+    assert not cache.enabled
+    cache.set('a', Response(b'a'), frozenset({TEXTS}))
+    assert cache.get('a') is None
+
+
+def test_linked_tables_of_write() -> None:
+    endpoint = SimpleNamespace(metadata=TextModel.metadata)
+    assert EndPoint._get_linked_tables(endpoint, TEXTS) == {
+        TEXTS,
+        TEXT_LOCALES,
+    }
+    assert EndPoint._get_linked_tables(endpoint, TEXT_LOCALES) == {
+        TEXTS,
+        TEXT_LOCALES,
+        LocaleModel.__table__,
+    }
+
+
+def test_linked_tables_of_maintained_sums() -> None:
+    endpoint = SimpleNamespace(metadata=TextModel.metadata)
+    assert EndPoint._get_linked_tables(
+        endpoint, ContainerTankPersonOpeningDropModel.__table__
+    ) == {
+        ContainerTankPersonOpeningDropModel.__table__,
+        ContainerTankPersonOpeningModel.__table__,
+        ContainerTankModel.__table__,
+    }
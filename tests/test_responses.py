@@ -0,0 +1,77 @@
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi.responses import ORJSONResponse
+
+from lib.methods._responses import (
+    ArrowResponse,
+    ColumnsJSONResponse,
+    CSVResponse,
+    NDJSONResponse,
+    negotiate,
+)
+
+
+def test_negotiate_default() -> None:
+    assert negotiate('', default=ORJSONResponse) is ORJSONResponse
+    assert negotiate('*/*', default=ORJSONResponse) is ORJSONResponse
+    assert negotiate('text/html', default=ORJSONResponse) is ORJSONResponse
+
+
+def test_negotiate_media_types() -> None:
+    assert negotiate('text/csv', default=ORJSONResponse) is CSVResponse
+    assert (
+        negotiate('application/x-ndjson', default=ORJSONResponse)
+        is NDJSONResponse
+    )
+    assert (
+        negotiate('Application/Vnd.Sort.Columns+JSON', default=ORJSONResponse)
+        is ColumnsJSONResponse
+    )
+
+
+def test_negotiate_quality() -> None:
+    assert (
+        negotiate('application/json;q=0.5, text/csv', default=ORJSONResponse)
+        is CSVResponse
+    )
+    assert (
+        negotiate('text/csv;q=0.5, application/json', default=ORJSONResponse)
+        is ORJSONResponse
+    )
+    assert negotiate('text/csv;q=0', default=ORJSONResponse) is ORJSONResponse
+    assert (
+        negotiate('text/csv;q=x, application/x-ndjson', default=ORJSONResponse)
+        is NDJSONResponse
+    )
+    # The earlier media type wins the ties.
+    assert (
+        negotiate('application/x-ndjson, text/csv', default=ORJSONResponse)
+        is NDJSONResponse
+    )
+
+
+def test_records_responses() -> None:
+    records = [dict(a=1, b='x'), dict(b='y,z', c=[1])]
+    assert CSVResponse(records).body == b'a,b,c\r\n1,x,\r\n,"y,z",[1]\r\n'
+    assert ColumnsJSONResponse(records).body == (
+        b'{"columns":["a","b","c"],"rows":[[1,"x",null],[null,"y,z",[1]]]}'
+    )
+    assert NDJSONResponse(records).body == (
+        b'{"a":1,"b":"x"}\n{"b":"y,z","c":[1]}\n'
+    )
+
+
+def test_arrow_response() -> None:
+    from pyarrow.ipc import open_stream
+
+    key = UUID(int=1)
+    records = [
+        dict(key=key, value=Decimal('1.5'), nested=dict(a=[1]), items=[1]),
+        dict(key=None, value=None, nested=None, items=[]),
+    ]
+    table = open_stream(ArrowResponse(records).body).read_all()
+    assert table.to_pylist() == [
+        dict(key=str(key), value=1.5, nested='{"a":[1]}', items='[1]'),
+        dict(key=None, value=None, nested=None, items='[]'),
+    ]
@@ -0,0 +1,59 @@
+from asyncio import run
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from sqlalchemy.dialects.postgresql import dialect
+
+from lib.methods.endpoint import EndPoint
+from lib.models import ContainerTankModel, TextLocaleModel
+
+
+class _Session(object):
+    def __init__(self) -> None:
+        self.executed: List[Any] = []
+
+    async def execute(self, statement: Any, params: List[Any]) -> None:
+        self.executed.append((statement, params))
+
+
+def _upsert(model: Any, *rows: Dict[str, Any]) -> List[str]:
+    endpoint = SimpleNamespace(Session=_Session())
+    run(EndPoint._upsert_rows(endpoint, model, list(rows)))
+    return [
+        str(statement.compile(dialect=dialect()))
+        for statement, _ in endpoint.Session.executed
+    ]
+
+
+def test_upsert_on_composite_key() -> None:
+    row = dict(
+        text_key='a',
+        locale_language_code='uk',
+        locale_country_code='UA',
+        value='x',
+    )
+    [sql] = _upsert(TextLocaleModel, row, row | dict(value='y'))
+    assert sql.endswith(
+        'ON CONFLICT (text_key, locale_language_code, locale_country_code) '
+        'DO UPDATE SET value = excluded.value, '
+        'updated_at = excluded.updated_at'
+    )
+
+
+def test_upsert_keeps_maintained_sums() -> None:
+    [sql] = _upsert(
+        ContainerTankModel, dict(container_id=1, type_id=2, current_volume=3)
+    )
+    assert sql.endswith(
+        'ON CONFLICT (container_id, type_id) '
+        'DO UPDATE SET updated_at = excluded.updated_at'
+    )
+
+
+def test_upsert_grouped_by_keys() -> None:
+    row = dict(
+        text_key='a', locale_language_code='uk', locale_country_code='UA'
+    )
+    statements = _upsert(TextLocaleModel, row | dict(value='x'), row)
+    assert len(statements) == 2
+    assert 'SET value = excluded.value' in statements[0]
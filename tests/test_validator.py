@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+from fastapi.exceptions import HTTPException
+from pytest import raises
+
+from lib.methods._validator import ModelValidator
+from lib.models import (
+    ContainerTankPersonOpeningDropModel,
+    ContainerTankPersonOpeningModel,
+    TextLocaleModel,
+    TextModel,
+)
+
+
+def test_validator_is_cached() -> None:
+    assert ModelValidator.get(TextModel) is ModelValidator.get(TextModel)
+    assert ModelValidator.get(TextModel).required == {'key', 'fallback'}
+
+
+def test_get_row() -> None:
+    validator = ModelValidator.get(TextModel)
+    assert validator.get_row(
+        dict(key='a', fallback='b', created_at='2024-01-02', locales=[])
+    ) == dict(key='a', fallback='b')
+    # The rows with the nested relationships are not flat.
+    assert (
+        validator.get_row(dict(key='a', fallback='b', locales=[dict()]))
+        is None
+    )
+
+
+def test_get_row_errors() -> None:
+    validator = ModelValidator.get(TextModel)
+    with raises(HTTPException) as error:
+        validator.get_row(dict(key='a'))
+    assert error.value.detail == (
+        'Table `texts` requires fields: `key`, `fallback`.'
+    )
+    with raises(HTTPException) as error:
+        validator.get_row(dict(key='a', fallback='b', other=1))
+    assert error.value.status_code == 400
+
+
+def test_get_row_skips_maintained_sums() -> None:
+    validator = ModelValidator.get(ContainerTankPersonOpeningModel)
+    assert 'volume' in validator.skipped
+    row = validator.get_row(
+        dict(
+            person_id=1,
+            container_id=2,
+            tank_type_id=3,
+            addition_id=4,
+            nomenclature_id=5,
+            volume='1.5',
+        )
+    )
+    assert row is not None and 'volume' not in row
+
+
+def test_get_row_converts_values() -> None:
+    validator = ModelValidator.get(ContainerTankPersonOpeningDropModel)
+    assert validator.get_row(dict(opening_id=1, volume='1.5')) == dict(
+        opening_id=1, volume=Decimal('1.5')
+    )
+    with raises(HTTPException) as error:
+        validator.get_row(dict(opening_id=1, volume='x'))
+    assert error.value.status_code == 400
+
+
+def test_get_item() -> None:
+    item = ModelValidator.get(TextModel).get_item(
+        dict(
+            key='a',
+            fallback='b',
+            locales=[
+                dict(
+                    locale_language_code='en',
+                    locale_country_code='us',
+                    value='c',
+                )
+            ],
+        )
+    )
+    assert isinstance(item, TextModel)
+    assert item.key == 'a'
+    assert isinstance(item.locales[0], TextLocaleModel)
+    assert item.locales[0].value == 'c'